@@ -20,6 +20,10 @@ class OrbitConfig(BaseModel):
     model: ModelConfig = Field(default_factory=ModelConfig)
     memory: MemoryConfig = Field(default_factory=MemoryConfig)
     safe_mode: bool = True
+    # Pretty-print persisted state (task files) for inspection
+    debug: bool = False
+    # Concurrent vision API calls made by visual interaction
+    vision_concurrency: int = 5
     
     @classmethod
     def load(cls, path: Optional[Path] = None) -> "OrbitConfig":
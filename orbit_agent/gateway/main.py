@@ -74,12 +74,7 @@ def main() -> None:
     # Telegram config from env (reuse uplink/main behavior)
     bot_token = _sanitize_telegram_token(os.environ.get("TELEGRAM_BOT_TOKEN"))
     allowed_users_str = os.environ.get("ORBIT_UPLINK_USERS", "")
-    allowed_users = set()
-    if allowed_users_str:
-        try:
-            allowed_users = {int(uid.strip()) for uid in allowed_users_str.split(",") if uid.strip()}
-        except Exception:
-            allowed_users = set()
+    allowed_users = frozenset(map(int, re.findall(r"\d+", allowed_users_str)))
 
     screenshots_env = os.environ.get("ORBIT_UPLINK_SCREENSHOTS", "")
     screenshot_on_task = str(screenshots_env).strip().lower() in {"1", "true", "yes", "on"}
@@ -1,34 +1,99 @@
 import json
 import os
+import time
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
+
+# Located coordinates older than this are re-located rather than trusted
+_ENTRY_TTL_S = 7 * 24 * 3600
+# How long a failed LOCATE suppresses retries for the same key
+_NEGATIVE_TTL_S = 30.0
 
 # A simple JSON-based persistent cache for UI element locations
 class UICache:
     def __init__(self, cache_file: str = "data/memory/ui_cache.json"):
         self.cache_file = Path(cache_file)
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        self.cache: Dict[str, List[int]] = self._load_cache()
+        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        # Misses are short-lived, so they stay in memory: key -> expiry (monotonic)
+        self._negative: Dict[str, float] = {}
+
+    @staticmethod
+    def make_key(description: str, screen_size: Optional[tuple] = None) -> str:
+        """Key an element by description and, when known, the screen resolution."""
+        if screen_size:
+            return f"{description}@{int(screen_size[0])}x{int(screen_size[1])}"
+        return description
 
-    def _load_cache(self) -> Dict[str, List[int]]:
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
         if not self.cache_file.exists():
             return {}
         try:
             with open(self.cache_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+                raw = json.load(f)
         except:
             return {}
+        cache = {}
+        for key, value in raw.items():
+            # Older files stored bare [x, y] lists.
+            if isinstance(value, list) and len(value) == 2:
+                value = {"coords": value, "hit_count": 0, "last_seen": time.time()}
+            if isinstance(value, dict) and value.get("coords"):
+                cache[key] = value
+        return cache
 
     def _save_cache(self):
-        with open(self.cache_file, "w", encoding="utf-8") as f:
+        tmp_file = self.cache_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
             json.dump(self.cache, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.cache_file)
 
     def get(self, key: str) -> Optional[List[int]]:
         """Retrieve coordinates for a description key."""
-        # Clean key to be generic? For now exact match
-        return self.cache.get(key)
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry.get("last_seen", 0) > _ENTRY_TTL_S:
+            self.evict(key)
+            return None
+        return entry["coords"]
 
     def set(self, key: str, coords: List[int]):
         """Save coordinates."""
-        self.cache[key] = coords
+        if not coords:
+            self.evict(key)
+            return
+        self._negative.pop(key, None)
+        entry = self.cache.get(key)
+        if entry is not None and list(entry["coords"]) == list(coords):
+            entry["last_seen"] = time.time()
+        else:
+            self.cache[key] = {"coords": list(coords), "hit_count": 0, "last_seen": time.time()}
+        self._save_cache()
+
+    def hit(self, key: str):
+        """Record that cached coordinates were confirmed on screen."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return
+        entry["hit_count"] = entry.get("hit_count", 0) + 1
+        entry["last_seen"] = time.time()
         self._save_cache()
+
+    def evict(self, key: str):
+        """Drop stale coordinates."""
+        if self.cache.pop(key, None) is not None:
+            self._save_cache()
+
+    def set_negative(self, key: str, ttl: float = _NEGATIVE_TTL_S):
+        """Remember that locating `key` just failed."""
+        self._negative[key] = time.monotonic() + ttl
+
+    def is_negative(self, key: str) -> bool:
+        expires = self._negative.get(key)
+        if expires is None:
+            return False
+        if time.monotonic() >= expires:
+            del self._negative[key]
+            return False
+        return True
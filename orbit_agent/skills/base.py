@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Dict, Any, Type, Optional
 from pydantic import BaseModel
 
@@ -32,6 +33,16 @@ class BaseSkill(ABC):
         """Pydantic model for output validation"""
         pass
 
+    @cached_property
+    def prompt_schema(self) -> Dict[str, Any]:
+        """Input schema simplified for planner prompts; built once per skill instance."""
+        schema = self.input_schema.model_json_schema()
+        return {
+            "description": self.config.description,
+            "arguments": {k: v.get("description", "") for k, v in schema.get("properties", {}).items()},
+            "required": schema.get("required", []),
+        }
+
     @abstractmethod
     async def execute(self, inputs: BaseModel) -> BaseModel:
         """
@@ -28,6 +28,7 @@ class DesktopInput(BaseModel):
     amount: int = Field(default=0, description="Scroll amount")
     duration: float = Field(default=0.5, description="Animation duration in seconds (also used for 'wait' in seconds)")
     save_path: Optional[str] = Field(default=None, description="For screenshot: save to this path (e.g. 'screenshots/step_1.png'). Next vision step MUST use this exact path.")
+    region: Optional[List[int]] = Field(default=None, description="For screenshot: capture only [left, top, width, height] instead of the full screen.")
     backend: Optional[Literal["auto", "pyautogui", "direct"]] = Field(
         default=None,
         description=(
@@ -43,6 +44,7 @@ class DesktopOutput(BaseModel):
     success: bool
     data: Optional[str] = None
     error: Optional[str] = None
+    path: Optional[str] = Field(default=None, description="For screenshot: where the image was saved.")
 
 class DesktopSkill(BaseSkill):
     """
@@ -296,8 +298,11 @@ class DesktopSkill(BaseSkill):
                 fname = f"screen_{datetime.now().strftime('%H%M%S')}.png"
                 path = os.path.join(os.getcwd(), "screenshots", fname)
             os.makedirs(os.path.dirname(path), exist_ok=True)
-            pyautogui.screenshot(path)
-            return DesktopOutput(success=True, data=f"Screenshot saved to {path}")
+            if inputs.region:
+                pyautogui.screenshot(path, region=tuple(inputs.region))
+            else:
+                pyautogui.screenshot(path)
+            return DesktopOutput(success=True, data=f"Screenshot saved to {path}", path=path)
 
         elif inputs.action == "wait":
             secs = max(0, inputs.duration)
@@ -3,9 +3,12 @@ from __future__ import annotations
 import json
 import os
 import asyncio
+import functools
+import random
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Type, Dict, Any, Literal
+from typing import Optional, Type, Dict, Any, Literal, Callable, Awaitable, Tuple
 
 import httpx
 from pydantic import BaseModel, Field
@@ -15,6 +18,26 @@ from orbit_agent.skills.base import BaseSkill, SkillConfig
 
 DEFAULT_API_BASE = "https://www.moltbook.com/api/v1"
 
+# Shared, never mutated (httpx copies headers into its own structure per request).
+_BASE_HEADERS: Dict[str, str] = {"Content-Type": "application/json"}
+
+# Gateway-style statuses that are worth retrying (the request never reached the app).
+_RETRY_STATUS = frozenset({502, 503, 504})
+
+# Short TTLs (seconds) for frequently polled, idempotent GET endpoints. Other GETs are only
+# de-duplicated while in flight, never cached.
+_GET_CACHE_TTL: Dict[str, float] = {
+    "/agents/status": 2.0,
+    "/agents/me": 2.0,
+    "/agents/dm/check": 2.0,
+    "/agents/dm/requests": 2.0,
+    "/agents/dm/conversations": 2.0,
+}
+
+# feed/search requests above one page are split into concurrent offset-based page fetches.
+_PAGE_SIZE = 25
+_PAGE_CONCURRENCY = 6
+
 
 class MoltbookInput(BaseModel):
     action: Literal[
@@ -91,7 +114,28 @@ class _CredsStore:
             return {}
 
     def save(self, data: Dict[str, Any]) -> None:
-        self.path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        # Write-then-rename so a crash mid-write never leaves a torn credentials file.
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_bytes(json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+        os.replace(tmp, self.path)
+
+    async def aload(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.load)
+
+    async def asave(self, data: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.save, data)
+
+
+def _page_items(payload: Any) -> Optional[Tuple[Dict[str, Any], str]]:
+    """Locate the item list in a feed/search payload; the API nests it under "data" on some endpoints."""
+    if not isinstance(payload, dict):
+        return None
+    for container in (payload.get("data"), payload):
+        if isinstance(container, dict):
+            for k in ("posts", "items", "results"):
+                if isinstance(container.get(k), list):
+                    return container, k
+    return None
 
 
 class MoltbookSkill(BaseSkill):
@@ -103,6 +147,31 @@ class MoltbookSkill(BaseSkill):
     def __init__(self):
         super().__init__()
         self._store = _CredsStore()
+        self._key_cache: Optional[Tuple[float, Optional[str]]] = None
+        self._auth_headers_cache: Dict[str, Dict[str, str]] = {}
+        # action -> handler(inputs, api_key); "register" is special-cased since it needs no key.
+        self._dispatch: Dict[str, Callable[[MoltbookInput, str], Awaitable[MoltbookOutput]]] = {
+            "status": self._do_status,
+            "me": self._do_me,
+            "post": self._do_post,
+            "comment": self._do_comment,
+            "feed": self._do_feed,
+            "search": self._do_search,
+            "upvote_post": self._do_upvote_post,
+            "downvote_post": self._do_downvote_post,
+            "upvote_comment": self._do_upvote_comment,
+            "dm_check": self._do_dm_check,
+            "dm_requests": self._do_dm_requests,
+            "dm_request": self._do_dm_request,
+            "dm_approve": self._do_dm_approve,
+            "dm_reject": self._do_dm_reject,
+            "dm_conversations": self._do_dm_conversations,
+            "dm_read": self._do_dm_read,
+            "dm_send": self._do_dm_send,
+        }
+        # GET single-flight + short-TTL cache, keyed on (path, params, api_key hash).
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._cache: Dict[Tuple, Tuple[float, MoltbookOutput]] = {}
 
     @property
     def default_config(self) -> SkillConfig:
@@ -126,9 +195,19 @@ class MoltbookSkill(BaseSkill):
         env = os.environ.get("MOLTBOOK_API_KEY")
         if env:
             return env.strip()
+        # Stored key is memoized against the credentials file mtime: one stat instead of read + parse.
+        try:
+            mtime = os.stat(self._store.path).st_mtime
+        except OSError:
+            self._key_cache = None
+            return None
+        if self._key_cache is not None and self._key_cache[0] == mtime:
+            return self._key_cache[1]
         saved = self._store.load()
         key = saved.get("api_key")
-        return str(key).strip() if key else None
+        resolved = str(key).strip() if key else None
+        self._key_cache = (mtime, resolved)
+        return resolved
 
     async def _request(
         self,
@@ -138,15 +217,114 @@ class MoltbookSkill(BaseSkill):
         json_body: Optional[dict] = None,
         params: Optional[dict] = None,
         timeout_s: float = 30.0,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        cache_ttl: Optional[float] = None,
+    ) -> MoltbookOutput:
+        send = functools.partial(
+            self._send, method, path, api_key, json_body=json_body, params=params, timeout_s=timeout_s,
+            max_retries=max_retries, backoff_base=backoff_base, backoff_cap=backoff_cap,
+        )
+        if method != "GET":
+            # Any write may change what the cached GETs would return.
+            self._cache.clear()
+            return await send()
+
+        key = (path, tuple(sorted((params or {}).items())), hash(api_key))
+        hit = self._cache.get(key)
+        if hit is not None:
+            if hit[0] > time.monotonic():
+                return hit[1]
+            del self._cache[key]
+
+        fut = self._inflight.get(key)
+        if fut is None:
+            ttl = _GET_CACHE_TTL.get(path, 0.0) if cache_ttl is None else cache_ttl
+            fut = asyncio.ensure_future(send())
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f: self._finish_get(key, f, ttl))
+        # Shield so one cancelled caller doesn't cancel the shared request for the others.
+        return await asyncio.shield(fut)
+
+    async def _get_paged(self, path: str, api_key: str, params: Dict[str, Any], limit: int) -> MoltbookOutput:
+        """GET `limit` items, fetching pages concurrently when more than one page is needed."""
+        if limit <= _PAGE_SIZE:
+            return await self._request("GET", path, api_key=api_key, params={**params, "limit": limit})
+
+        sem = asyncio.Semaphore(_PAGE_CONCURRENCY)
+
+        async def fetch(offset: int) -> MoltbookOutput:
+            async with sem:
+                return await self._request("GET", path, api_key=api_key, params={**params, "offset": offset, "limit": _PAGE_SIZE})
+
+        pages = await asyncio.gather(*(fetch(off) for off in range(0, limit, _PAGE_SIZE)))
+        first = pages[0]
+        found = _page_items(first.data) if first.success else None
+        if found is None:
+            return first
+        container, list_key = found
+        items = list(container[list_key])
+        for page in pages[1:]:
+            more = _page_items(page.data) if page.success else None
+            if more is None or not more[0][more[1]]:
+                break
+            items.extend(more[0][more[1]])
+        # Shallow copies so the (possibly cached) first page isn't mutated.
+        merged = dict(first.data)
+        if container is first.data:
+            merged[list_key] = items[:limit]
+        else:
+            merged["data"] = {**container, list_key: items[:limit]}
+        return MoltbookOutput.model_construct(success=True, data=merged, error=None)
+
+    def _finish_get(self, key: Tuple, fut: asyncio.Future, ttl: float) -> None:
+        self._inflight.pop(key, None)
+        if ttl <= 0 or fut.cancelled() or fut.exception() is not None:
+            return
+        out = fut.result()
+        if out.success:
+            self._cache[key] = (time.monotonic() + ttl, out)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        api_key: Optional[str],
+        json_body: Optional[dict] = None,
+        params: Optional[dict] = None,
+        timeout_s: float = 30.0,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
     ) -> MoltbookOutput:
         url = DEFAULT_API_BASE + path
-        headers = {"Content-Type": "application/json"}
+        headers = _BASE_HEADERS
         if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
+            headers = self._auth_headers_cache.get(api_key)
+            if headers is None:
+                headers = {**_BASE_HEADERS, "Authorization": f"Bearer {api_key}"}
+                self._auth_headers_cache[api_key] = headers
+
+        # Retry idempotent GETs by default; mutating calls opt in explicitly to avoid double-posts.
+        if max_retries is None:
+            max_retries = 2 if method == "GET" else 0
 
         try:
             async with httpx.AsyncClient(timeout=httpx.Timeout(timeout_s, read=timeout_s), follow_redirects=False) as client:
-                resp = await client.request(method, url, headers=headers, json=json_body, params=params)
+                attempt = 0
+                while True:
+                    try:
+                        resp = await client.request(method, url, headers=headers, json=json_body, params=params)
+                    except (httpx.TimeoutException, httpx.TransportError):
+                        if attempt >= max_retries:
+                            raise
+                    else:
+                        if resp.status_code not in _RETRY_STATUS or attempt >= max_retries:
+                            break
+                    # Capped exponential backoff with jitter.
+                    await asyncio.sleep(min(backoff_cap, backoff_base * 2 ** attempt) + random.random() * 0.3)
+                    attempt += 1
             # Moltbook returns JSON with {"success": true/false, ...}
             try:
                 payload = resp.json()
@@ -159,164 +337,163 @@ class MoltbookSkill(BaseSkill):
                 msg = str(err or payload)
                 if hint:
                     msg = f"{msg} (hint: {hint})"
-                return MoltbookOutput(success=False, data={"status_code": resp.status_code, "response": payload}, error=msg)
+                return MoltbookOutput.model_construct(success=False, data={"status_code": resp.status_code, "response": payload}, error=msg)
 
             ok = bool(payload.get("success", True))
             if not ok:
-                return MoltbookOutput(success=False, data=payload, error=str(payload.get("error") or payload.get("hint") or "request failed"))
-            return MoltbookOutput(success=True, data=payload)
+                return MoltbookOutput.model_construct(success=False, data=payload, error=str(payload.get("error") or payload.get("hint") or "request failed"))
+            return MoltbookOutput.model_construct(success=True, data=payload)
         except httpx.TimeoutException as e:
             # httpx timeouts often stringify to "", so include the exception type.
-            return MoltbookOutput(success=False, error=f"Timeout contacting Moltbook ({type(e).__name__})")
+            return MoltbookOutput.model_construct(success=False, error=f"Timeout contacting Moltbook ({type(e).__name__})")
         except httpx.HTTPError as e:
-            return MoltbookOutput(success=False, error=f"HTTP error contacting Moltbook ({type(e).__name__}): {e!r}")
+            return MoltbookOutput.model_construct(success=False, error=f"HTTP error contacting Moltbook ({type(e).__name__}): {e!r}")
         except Exception as e:
             msg = str(e).strip()
             if not msg:
                 msg = repr(e)
-            return MoltbookOutput(success=False, error=msg)
+            return MoltbookOutput.model_construct(success=False, error=msg)
 
     async def execute(self, inputs: MoltbookInput) -> MoltbookOutput:
         action = inputs.action
 
         if action == "register":
-            if not inputs.name or not inputs.description:
-                return MoltbookOutput(success=False, error="register requires name and description")
-            # Register can be slow/flaky; use longer timeout + a couple retries.
-            last: MoltbookOutput = MoltbookOutput(success=False, error="register failed")
-            for i in range(3):
-                out = await self._request(
-                    "POST",
-                    "/agents/register",
-                    api_key=None,
-                    json_body={"name": inputs.name, "description": inputs.description},
-                    timeout_s=90.0,
-                )
-                if out.success:
-                    last = out
-                    break
-                last = out
-                # Only retry on timeouts / transient network errors.
-                err = (out.error or "").lower()
-                if "timeout" not in err:
-                    break
-                await asyncio.sleep(0.6 + (i * 0.8))
-            out = last
-            if out.success and out.data:
-                agent = (out.data.get("agent") or {}) if isinstance(out.data, dict) else {}
-                api_key = agent.get("api_key")
-                if api_key:
-                    self._store.save(
-                        {
-                            "api_key": api_key,
-                            "agent_name": inputs.name,
-                            "claim_url": agent.get("claim_url"),
-                            "verification_code": agent.get("verification_code"),
-                        }
-                    )
-            return out
+            return await self._do_register(inputs)
+
+        handler = self._dispatch.get(action)
+        if handler is None:
+            return MoltbookOutput.model_construct(success=False, error=f"Unknown action: {action}")
 
         api_key = self._resolve_api_key(inputs.api_key)
         if not api_key:
-            return MoltbookOutput(success=False, error="No Moltbook API key. Register first or set MOLTBOOK_API_KEY.")
-
-        if action == "status":
-            return await self._request("GET", "/agents/status", api_key=api_key)
-
-        if action == "me":
-            return await self._request("GET", "/agents/me", api_key=api_key)
-
-        if action == "post":
-            if not inputs.submolt or not inputs.title:
-                return MoltbookOutput(success=False, error="post requires submolt and title")
-            body: Dict[str, Any] = {"submolt": inputs.submolt, "title": inputs.title}
-            if inputs.url:
-                body["url"] = inputs.url
-            else:
-                body["content"] = inputs.content or ""
-            return await self._request("POST", "/posts", api_key=api_key, json_body=body)
-
-        if action == "comment":
-            if not inputs.post_id or not inputs.content:
-                return MoltbookOutput(success=False, error="comment requires post_id and content")
-            body: Dict[str, Any] = {"content": inputs.content}
-            if inputs.parent_id:
-                body["parent_id"] = inputs.parent_id
-            return await self._request("POST", f"/posts/{inputs.post_id}/comments", api_key=api_key, json_body=body)
-
-        if action == "feed":
-            params = {"sort": inputs.sort or "new", "limit": int(inputs.limit or 10)}
-            if inputs.submolt:
-                # convenience endpoint
-                return await self._request("GET", f"/submolts/{inputs.submolt}/feed", api_key=api_key, params=params)
-            return await self._request("GET", "/feed", api_key=api_key, params=params)
-
-        if action == "search":
-            if not inputs.q:
-                return MoltbookOutput(success=False, error="search requires q")
-            params = {"q": inputs.q, "limit": int(inputs.limit or 10)}
-            return await self._request("GET", "/search", api_key=api_key, params=params)
-
-        # Voting
-        if action == "upvote_post":
-            if not inputs.post_id:
-                return MoltbookOutput(success=False, error="upvote_post requires post_id")
-            return await self._request("POST", f"/posts/{inputs.post_id}/upvote", api_key=api_key)
-
-        if action == "downvote_post":
-            if not inputs.post_id:
-                return MoltbookOutput(success=False, error="downvote_post requires post_id")
-            return await self._request("POST", f"/posts/{inputs.post_id}/downvote", api_key=api_key)
-
-        if action == "upvote_comment":
-            if not inputs.comment_id:
-                return MoltbookOutput(success=False, error="upvote_comment requires comment_id")
-            return await self._request("POST", f"/comments/{inputs.comment_id}/upvote", api_key=api_key)
-
-        # DMs
-        if action == "dm_check":
-            return await self._request("GET", "/agents/dm/check", api_key=api_key)
-
-        if action == "dm_requests":
-            return await self._request("GET", "/agents/dm/requests", api_key=api_key)
-
-        if action == "dm_request":
-            if not inputs.message:
-                return MoltbookOutput(success=False, error="dm_request requires message")
-            body: Dict[str, Any] = {"message": inputs.message}
-            if inputs.to:
-                body["to"] = inputs.to
-            if inputs.to_owner:
-                body["to_owner"] = inputs.to_owner
-            if "to" not in body and "to_owner" not in body:
-                return MoltbookOutput(success=False, error="dm_request requires to or to_owner")
-            return await self._request("POST", "/agents/dm/request", api_key=api_key, json_body=body)
-
-        if action == "dm_approve":
-            if not inputs.conversation_id:
-                return MoltbookOutput(success=False, error="dm_approve requires conversation_id")
-            return await self._request("POST", f"/agents/dm/requests/{inputs.conversation_id}/approve", api_key=api_key)
-
-        if action == "dm_reject":
-            if not inputs.conversation_id:
-                return MoltbookOutput(success=False, error="dm_reject requires conversation_id")
-            return await self._request("POST", f"/agents/dm/requests/{inputs.conversation_id}/reject", api_key=api_key)
-
-        if action == "dm_conversations":
-            return await self._request("GET", "/agents/dm/conversations", api_key=api_key)
-
-        if action == "dm_read":
-            if not inputs.conversation_id:
-                return MoltbookOutput(success=False, error="dm_read requires conversation_id")
-            return await self._request("GET", f"/agents/dm/conversations/{inputs.conversation_id}", api_key=api_key)
-
-        if action == "dm_send":
-            if not inputs.conversation_id or not inputs.message:
-                return MoltbookOutput(success=False, error="dm_send requires conversation_id and message")
-            body = {"message": inputs.message}
-            if inputs.needs_human_input is True:
-                body["needs_human_input"] = True
-            return await self._request("POST", f"/agents/dm/conversations/{inputs.conversation_id}/send", api_key=api_key, json_body=body)
-
-        return MoltbookOutput(success=False, error=f"Unknown action: {action}")
+            return MoltbookOutput.model_construct(success=False, error="No Moltbook API key. Register first or set MOLTBOOK_API_KEY.")
+        return await handler(inputs, api_key)
+
+    async def _do_register(self, inputs: MoltbookInput) -> MoltbookOutput:
+        if not inputs.name or not inputs.description:
+            return MoltbookOutput.model_construct(success=False, error="register requires name and description")
+        # Register can be slow/flaky; use longer timeout + a couple retries.
+        out = await self._request(
+            "POST",
+            "/agents/register",
+            api_key=None,
+            json_body={"name": inputs.name, "description": inputs.description},
+            timeout_s=90.0,
+            max_retries=2,  # 3 attempts in total
+            backoff_base=0.6,
+        )
+        if out.success and out.data:
+            agent = (out.data.get("agent") or {}) if isinstance(out.data, dict) else {}
+            api_key = agent.get("api_key")
+            if api_key:
+                await self._store.asave(
+                    {
+                        "api_key": api_key,
+                        "agent_name": inputs.name,
+                        "claim_url": agent.get("claim_url"),
+                        "verification_code": agent.get("verification_code"),
+                    }
+                )
+                try:
+                    self._key_cache = (os.stat(self._store.path).st_mtime, str(api_key).strip())
+                except OSError:
+                    self._key_cache = None
+        return out
+
+    async def _do_status(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        return await self._request("GET", "/agents/status", api_key=api_key)
+
+    async def _do_me(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        return await self._request("GET", "/agents/me", api_key=api_key)
+
+    async def _do_post(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.submolt or not inputs.title:
+            return MoltbookOutput.model_construct(success=False, error="post requires submolt and title")
+        body: Dict[str, Any] = {"submolt": inputs.submolt, "title": inputs.title}
+        if inputs.url:
+            body["url"] = inputs.url
+        else:
+            body["content"] = inputs.content or ""
+        return await self._request("POST", "/posts", api_key=api_key, json_body=body)
+
+    async def _do_comment(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.post_id or not inputs.content:
+            return MoltbookOutput.model_construct(success=False, error="comment requires post_id and content")
+        body: Dict[str, Any] = {"content": inputs.content}
+        if inputs.parent_id:
+            body["parent_id"] = inputs.parent_id
+        return await self._request("POST", f"/posts/{inputs.post_id}/comments", api_key=api_key, json_body=body)
+
+    async def _do_feed(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        params = {"sort": inputs.sort or "new"}
+        limit = int(inputs.limit or 10)
+        if inputs.submolt:
+            # convenience endpoint
+            return await self._get_paged(f"/submolts/{inputs.submolt}/feed", api_key, params, limit)
+        return await self._get_paged("/feed", api_key, params, limit)
+
+    async def _do_search(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.q:
+            return MoltbookOutput.model_construct(success=False, error="search requires q")
+        return await self._get_paged("/search", api_key, {"q": inputs.q}, int(inputs.limit or 10))
+
+    # Voting
+    async def _do_upvote_post(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.post_id:
+            return MoltbookOutput.model_construct(success=False, error="upvote_post requires post_id")
+        return await self._request("POST", f"/posts/{inputs.post_id}/upvote", api_key=api_key)
+
+    async def _do_downvote_post(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.post_id:
+            return MoltbookOutput.model_construct(success=False, error="downvote_post requires post_id")
+        return await self._request("POST", f"/posts/{inputs.post_id}/downvote", api_key=api_key)
+
+    async def _do_upvote_comment(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.comment_id:
+            return MoltbookOutput.model_construct(success=False, error="upvote_comment requires comment_id")
+        return await self._request("POST", f"/comments/{inputs.comment_id}/upvote", api_key=api_key)
 
+    # DMs
+    async def _do_dm_check(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        return await self._request("GET", "/agents/dm/check", api_key=api_key)
+
+    async def _do_dm_requests(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        return await self._request("GET", "/agents/dm/requests", api_key=api_key)
+
+    async def _do_dm_request(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.message:
+            return MoltbookOutput.model_construct(success=False, error="dm_request requires message")
+        body: Dict[str, Any] = {"message": inputs.message}
+        if inputs.to:
+            body["to"] = inputs.to
+        if inputs.to_owner:
+            body["to_owner"] = inputs.to_owner
+        if "to" not in body and "to_owner" not in body:
+            return MoltbookOutput.model_construct(success=False, error="dm_request requires to or to_owner")
+        return await self._request("POST", "/agents/dm/request", api_key=api_key, json_body=body)
+
+    async def _do_dm_approve(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.conversation_id:
+            return MoltbookOutput.model_construct(success=False, error="dm_approve requires conversation_id")
+        return await self._request("POST", f"/agents/dm/requests/{inputs.conversation_id}/approve", api_key=api_key)
+
+    async def _do_dm_reject(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.conversation_id:
+            return MoltbookOutput.model_construct(success=False, error="dm_reject requires conversation_id")
+        return await self._request("POST", f"/agents/dm/requests/{inputs.conversation_id}/reject", api_key=api_key)
+
+    async def _do_dm_conversations(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        return await self._request("GET", "/agents/dm/conversations", api_key=api_key)
+
+    async def _do_dm_read(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.conversation_id:
+            return MoltbookOutput.model_construct(success=False, error="dm_read requires conversation_id")
+        return await self._request("GET", f"/agents/dm/conversations/{inputs.conversation_id}", api_key=api_key)
+
+    async def _do_dm_send(self, inputs: MoltbookInput, api_key: str) -> MoltbookOutput:
+        if not inputs.conversation_id or not inputs.message:
+            return MoltbookOutput.model_construct(success=False, error="dm_send requires conversation_id and message")
+        body: Dict[str, Any] = {"message": inputs.message}
+        if inputs.needs_human_input is True:
+            body["needs_human_input"] = True
+        return await self._request("POST", f"/agents/dm/conversations/{inputs.conversation_id}/send", api_key=api_key, json_body=body)
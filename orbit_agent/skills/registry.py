@@ -111,7 +111,7 @@ class SkillRegistry:
                 model_name = (self.config.model.model_name if self.config else "gpt-5.1")
                 vision_skill = VisionSkill(key, model_name=model_name)
                 self.register_skill(vision_skill)
-                self.register_skill(VisualInteractionSkill(vision_skill))
+                self.register_skill(VisualInteractionSkill(vision_skill, vision_concurrency=self.config.vision_concurrency))
                 
                 # Register Set-of-Mark Vision (precision clicking)
                 self.register_skill(SoMVisionSkill(key, model_name=model_name))
@@ -141,15 +141,4 @@ class SkillRegistry:
         return self._skills[name]
     
     def list_skills(self) -> Dict[str, Any]:
-        info = {}
-        for name, skill in self._skills.items():
-            schema = skill.input_schema.model_json_schema()
-            # Simplify schema for prompt
-            props = {k: v.get("description", "") for k, v in schema.get("properties", {}).items()}
-            required = schema.get("required", [])
-            info[name] = {
-                "description": skill.config.description,
-                "arguments": props,
-                "required": required
-            }
-        return info
+        return {name: skill.prompt_schema for name, skill in self._skills.items()}
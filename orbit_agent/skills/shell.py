@@ -1,10 +1,82 @@
 import asyncio
+import contextlib
+from collections import deque
 from typing import Type, Optional
 from pydantic import BaseModel, Field
 
 from orbit_agent.skills.base import BaseSkill, SkillConfig
 import os
 import re
+import shlex
+
+# Anything that needs a real shell to interpret (pipes, redirection, expansion, globbing, chaining).
+_SHELL_META = ("|", "&", ";", ">", "<", "`", "$", "*", "?", "[", "~", "\n", "(", ")", "{", "}", "#")
+
+
+def _exec_argv(command: str) -> Optional[list[str]]:
+    """
+    Return argv for a plain command that can be spawned without a shell, else None.
+    Windows is excluded: most everyday commands there (echo, dir, ...) are cmd builtins.
+    """
+    if os.name == "nt" or any(ch in command for ch in _SHELL_META):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # `FOO=bar cmd` env assignments are shell syntax too.
+    if not argv or "=" in argv[0]:
+        return None
+    return argv
+
+
+# Destructive-command guard; IGNORECASE avoids lowercasing a copy of every command.
+_DESTRUCTIVE_RE = re.compile(
+    "|".join([
+        r"\b(del|erase)\b",
+        r"\b(rmdir|rd)\b",
+        r"\bformat\b",
+        r"\bdiskpart\b",
+        r"\bbcdedit\b",
+        r"\breg\s+delete\b",
+        r"\bpowershell\b.*\bremove-item\b",
+        r"\brm\b.*\b-rf\b",
+    ]),
+    re.IGNORECASE,
+)
+_PROTECTED_HINT_RE = re.compile(
+    r"(\\windows\\|\\system32\\|c:\\windows|c:\\system32|program files|programdata)",
+    re.IGNORECASE,
+)
+
+_READ_CHUNK = 64 * 1024
+# Keep only the last ~1MB of each stream so runaway output can't grow memory unbounded.
+_TAIL_BYTES = 1024 * 1024
+
+
+class _Tail(deque):
+    """Chunks of the last ~_TAIL_BYTES of a stream; `dropped` is set once older output was discarded."""
+    dropped = False
+
+
+async def _drain(stream: asyncio.StreamReader, tail: _Tail) -> None:
+    """Read `stream` to EOF into the bounded `tail` (state survives a timeout cancelling the read)."""
+    size = 0
+    while True:
+        chunk = await stream.read(_READ_CHUNK)
+        if not chunk:
+            return
+        tail.append(chunk)
+        size += len(chunk)
+        while size - len(tail[0]) >= _TAIL_BYTES:
+            size -= len(tail.popleft())
+            tail.dropped = True
+
+
+def _decode_tail(tail: _Tail) -> str:
+    # Strip on bytes and decode only the trimmed payload (silent commands skip decode entirely).
+    data = b"".join(tail)
+    return data.strip().decode("utf-8", "replace") if data else ""
 
 class ShellInput(BaseModel):
     command: str = Field(description="Command to execute in the shell")
@@ -17,6 +89,7 @@ class ShellOutput(BaseModel):
     stderr: str
     exit_code: int
     error: str = ""
+    truncated: bool = Field(default=False, description="True if output exceeded the buffer and only the tail was kept")
 
 class ShellCommandSkill(BaseSkill):
     @property
@@ -40,45 +113,66 @@ class ShellCommandSkill(BaseSkill):
             # Extra safety: block obviously destructive commands unless explicitly allowed.
             # This prevents accidents even if permissions are misconfigured somewhere.
             if str(os.environ.get("ORBIT_ALLOW_DANGEROUS_COMMANDS", "")).strip().lower() not in {"1", "true", "yes", "on"}:
-                cmd = inputs.command.strip().lower()
-                destructive = [
-                    r"\b(del|erase)\b",
-                    r"\b(rmdir|rd)\b",
-                    r"\bformat\b",
-                    r"\bdiskpart\b",
-                    r"\bbcdedit\b",
-                    r"\breg\s+delete\b",
-                    r"\bpowershell\b.*\bremove-item\b",
-                    r"\brm\b.*\b-rf\b",
-                ]
-                protected_hint = r"(\\windows\\|\\system32\\|c:\\windows|c:\\system32|program files|programdata)"
-                if any(re.search(pat, cmd) for pat in destructive) and re.search(protected_hint, cmd):
-                    return ShellOutput(stdout="", stderr="", exit_code=1, error="Blocked potentially destructive command targeting system paths.")
+                cmd = inputs.command
+                if _DESTRUCTIVE_RE.search(cmd) and _PROTECTED_HINT_RE.search(cmd):
+                    return ShellOutput.model_construct(stdout="", stderr="", exit_code=1, error="Blocked potentially destructive command targeting system paths.")
 
             cwd = inputs.cwd if inputs.cwd else "."
             
-            process = await asyncio.create_subprocess_shell(
-                inputs.command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=cwd
-            )
+            # Skip the intermediate /bin/sh for simple commands; fall back to the shell for
+            # anything it must interpret, or when argv[0] is a builtin with no executable (cd, source, ...).
+            process = None
+            argv = _exec_argv(inputs.command)
+            if argv:
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *argv,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        cwd=cwd
+                    )
+                except FileNotFoundError:
+                    process = None
+            if process is None:
+                process = await asyncio.create_subprocess_shell(
+                    inputs.command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=cwd
+                )
             
+            out_tail = _Tail()
+            err_tail = _Tail()
             try:
-                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=inputs.timeout_seconds)
+                await asyncio.wait_for(
+                    asyncio.gather(_drain(process.stdout, out_tail), _drain(process.stderr, err_tail), process.wait()),
+                    timeout=inputs.timeout_seconds,
+                )
             except asyncio.TimeoutError:
-                process.kill()
-                return ShellOutput(success=False, stdout="", stderr="", exit_code=-1, error="Command timed out")
-            
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                # Reap promptly so the child doesn't linger as a zombie holding pipe FDs.
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(process.wait(), timeout=5)
+                process = None
+                return ShellOutput.model_construct(
+                    success=False,
+                    stdout=_decode_tail(out_tail),
+                    stderr=_decode_tail(err_tail),
+                    exit_code=-1,
+                    error="Command timed out",
+                    truncated=out_tail.dropped or err_tail.dropped,
+                )
+
             exit_code = process.returncode or 0
-            out_s = stdout.decode().strip()
-            err_s = stderr.decode().strip()
+            process = None
             success = (exit_code == 0)
-            return ShellOutput(
+            return ShellOutput.model_construct(
                 success=success,
-                stdout=out_s,
-                stderr=err_s,
-                exit_code=exit_code
+                stdout=_decode_tail(out_tail),
+                stderr=_decode_tail(err_tail),
+                exit_code=exit_code,
+                truncated=out_tail.dropped or err_tail.dropped,
             )
         except Exception as e:
-            return ShellOutput(success=False, stdout="", stderr="", exit_code=-1, error=str(e))
+            return ShellOutput.model_construct(success=False, stdout="", stderr="", exit_code=-1, error=str(e))
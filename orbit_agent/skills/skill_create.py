@@ -1,7 +1,8 @@
+import asyncio
 import os
 import re
 from pathlib import Path
-from typing import Type, Optional, Any, List
+from typing import Type, Optional, Any, List, Dict, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -10,6 +11,117 @@ from orbit_agent.models.openai_client import OpenAIClient
 from orbit_agent.models.base import Message
 
 
+_NAME_RE = re.compile(r"[a-z_][a-z0-9_]{2,60}")
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+# Kept free of per-request values (class/skill name go in the user message) so every generation
+# shares an identical prefix; long enough (>1024 tokens) for provider-side prompt caching to apply.
+_SYSTEM_PROMPT = """You are writing a Python plugin for Orbit Agent.
+Return ONLY the Python file contents (no markdown).
+
+Requirements:
+- Define exactly ONE BaseSkill subclass.
+- The skill must be safe by default (no destructive shell/file operations).
+- The class name and default_config.name are given in the user message; use them exactly.
+- input/output schemas must be Pydantic models.
+- __init__ must be no-arg and call super().__init__().
+- Implement execute() and return success flags.
+- Do NOT use relative imports.
+
+The plugin API:
+- Import the base classes with: from orbit_agent.skills.base import BaseSkill, SkillConfig
+- SkillConfig(name: str, description: str, version: str = "1.0.0", permissions_required: list[str] = [])
+- BaseSkill subclasses implement four members:
+    default_config (property) -> SkillConfig
+    input_schema (property) -> the Pydantic input model class
+    output_schema (property) -> the Pydantic output model class
+    async execute(self, inputs) -> an instance of the output model
+- The agent validates planner-provided arguments against input_schema before calling execute(),
+  so execute() receives an already-validated model instance.
+- Every input field should have a Field(description=...): the descriptions are shown to the planner
+  and are the only documentation it sees when deciding how to call the skill.
+- The output model must have a `success: bool` field and an `error` string field (default "").
+  Never raise out of execute(); catch exceptions and return success=False with error=str(e).
+  A non-empty `error` marks the step as failed, so leave it empty on success.
+
+Conventions:
+- Use only the standard library, pydantic and httpx (already installed). If the task needs another
+  third-party package, import it inside execute() and return a clear error if it is missing.
+- execute() runs on the agent's asyncio event loop. Do not block it: use httpx.AsyncClient for network
+  calls and wrap blocking work (file I/O, CPU-heavy parsing) in `await asyncio.to_thread(...)`.
+- Always pass explicit timeouts to network calls (10-30 seconds is typical).
+- Read secrets (API tokens) from environment variables via os.environ.get(); never hard-code them,
+  never print or return them, and fail with a helpful error naming the variable when it is unset.
+- Only write files under ./data/ and create parent directories with mkdir(parents=True, exist_ok=True).
+- Keep outputs compact: truncate long text to a few thousand characters so they fit in the agent's context.
+
+Example of a complete, valid plugin file:
+
+import asyncio
+import os
+from typing import Type
+
+import httpx
+from pydantic import BaseModel, Field
+
+from orbit_agent.skills.base import BaseSkill, SkillConfig
+
+
+class WeatherInput(BaseModel):
+    city: str = Field(..., description="City name, e.g. 'Berlin'.")
+    units: str = Field(default="metric", description="'metric' or 'imperial'.")
+
+
+class WeatherOutput(BaseModel):
+    success: bool
+    summary: str = ""
+    error: str = ""
+
+
+class WeatherLookupSkill(BaseSkill):
+    def __init__(self):
+        super().__init__()
+
+    @property
+    def default_config(self) -> SkillConfig:
+        return SkillConfig(
+            name="weather_lookup",
+            description="Look up the current weather for a city.",
+            permissions_required=["network"],
+        )
+
+    @property
+    def input_schema(self) -> Type[BaseModel]:
+        return WeatherInput
+
+    @property
+    def output_schema(self) -> Type[BaseModel]:
+        return WeatherOutput
+
+    async def execute(self, inputs: WeatherInput) -> WeatherOutput:
+        api_key = os.environ.get("WEATHER_API_KEY")
+        if not api_key:
+            return WeatherOutput(success=False, error="WEATHER_API_KEY is not set.")
+        try:
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                resp = await client.get(
+                    "https://api.example.com/weather",
+                    params={"q": inputs.city, "units": inputs.units, "key": api_key},
+                )
+            if resp.status_code >= 400:
+                return WeatherOutput(success=False, error=f"Weather API returned HTTP {resp.status_code}")
+            data = resp.json()
+            summary = f"{inputs.city}: {data.get('description', 'unknown')}, {data.get('temp', '?')} degrees"
+            return WeatherOutput(success=True, summary=summary[:2000])
+        except Exception as e:
+            return WeatherOutput(success=False, error=str(e))
+
+When the requested integration cannot work without credentials or services you cannot assume, still
+produce a skill that imports cleanly and returns success=False with an explanatory error (or a clearly
+labelled stub result) instead of guessing at private APIs.
+"""
+
+
 class SkillCreateInput(BaseModel):
     name: str = Field(description="New skill name (snake_case). Example: 'todoist_skill'.")
     description: str = Field(description="What the skill should do, in plain English.")
@@ -42,6 +154,9 @@ class SkillCreateSkill(BaseSkill):
         self.registry = registry
         # IMPORTANT: BaseSkill.config is a SkillConfig. Don't overwrite it.
         self.orbit_config = orbit_config
+        # (api_key, model_name) -> client, so repeated generations reuse one connection pool.
+        self._client_cache: Dict[Tuple[str, str], OpenAIClient] = {}
+        self._skill_dir_cached: Optional[Path] = None
 
     @property
     def default_config(self) -> SkillConfig:
@@ -60,19 +175,22 @@ class SkillCreateSkill(BaseSkill):
         return SkillCreateOutput
 
     def _enabled(self, var: str) -> bool:
-        return str(os.environ.get(var, "")).strip().lower() in {"1", "true", "yes", "on"}
+        return str(os.environ.get(var, "")).strip().lower() in _TRUTHY
 
     def _sanitize_name(self, name: str) -> Optional[str]:
         n = name.strip().lower().replace("-", "_").replace(" ", "_")
-        if not re.fullmatch(r"[a-z_][a-z0-9_]{2,60}", n):
+        if not _NAME_RE.fullmatch(n):
             return None
         return n
 
     def _skill_dir(self) -> Path:
         # Keep runtime-created skills out of the package code by default.
-        base = Path.cwd() / "data" / "skills"
-        base.mkdir(parents=True, exist_ok=True)
-        return base
+        # Resolved and created once per instance.
+        if self._skill_dir_cached is None:
+            base = Path.cwd() / "data" / "skills"
+            base.mkdir(parents=True, exist_ok=True)
+            self._skill_dir_cached = base
+        return self._skill_dir_cached
 
     def _get_api_key(self) -> Optional[str]:
         # Prefer configured env-var name if available
@@ -98,31 +216,23 @@ class SkillCreateSkill(BaseSkill):
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY not set (required for generate_with_llm).")
 
-        client = OpenAIClient(api_key=api_key, model_name=self._get_model_name())
+        model_name = self._get_model_name()
+        key = (api_key, model_name)
+        client = self._client_cache.get(key)
+        if client is None:
+            client = self._client_cache[key] = OpenAIClient(api_key=api_key, model_name=model_name)
         class_name = "".join([part.capitalize() for part in name.split("_")]) + "Skill"
 
-        system = (
-            "You are writing a Python plugin for Orbit Agent.\n"
-            "Return ONLY the Python file contents (no markdown).\n"
-            "Requirements:\n"
-            "- Define exactly ONE BaseSkill subclass.\n"
-            "- The skill must be safe by default (no destructive shell/file operations).\n"
-            "- The class must be named: " + class_name + "\n"
-            "- default_config.name must be: " + name + "\n"
-            "- input/output schemas must be Pydantic models.\n"
-            "- __init__ must be no-arg and call super().__init__().\n"
-            "- Implement execute() and return success flags.\n"
-            "- Do NOT use relative imports.\n"
-        )
-
         user = (
+            f"The class must be named: {class_name}\n"
+            f"default_config.name must be: {name}\n"
             f"Skill description: {description}\n"
             f"permissions_required: {permissions_required}\n"
             "Implement the skill. If external integration would be required, stub it safely and explain in the output.\n"
         )
 
         resp = await client.generate(
-            [Message(role="system", content=system), Message(role="user", content=user)],
+            [Message(role="system", content=_SYSTEM_PROMPT), Message(role="user", content=user)],
             temperature=0.1,
         )
         return resp.content.strip()
@@ -152,7 +262,7 @@ class SkillCreateSkill(BaseSkill):
                 code = f'''from typing import Type, Optional\nfrom pydantic import BaseModel, Field\nfrom orbit_agent.skills.base import BaseSkill, SkillConfig\n\n\nclass Input(BaseModel):\n    text: str = Field(..., description="Input text")\n\n\nclass Output(BaseModel):\n    success: bool\n    data: str = ""\n    error: str = ""\n\n\nclass {''.join([p.capitalize() for p in clean.split('_')])}Skill(BaseSkill):\n    @property\n    def default_config(self) -> SkillConfig:\n        return SkillConfig(name="{clean}", description="{inputs.description}", permissions_required={inputs.permissions_required})\n\n    @property\n    def input_schema(self) -> Type[BaseModel]:\n        return Input\n\n    @property\n    def output_schema(self) -> Type[BaseModel]:\n        return Output\n\n    async def execute(self, inputs: Input) -> Output:\n        return Output(success=True, data=f"Stub skill received: {inputs.text}")\n'''
 
             file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(code, encoding="utf-8")
+            await asyncio.to_thread(file_path.write_text, code, encoding="utf-8")
 
             loaded_name = None
             if inputs.auto_load:
@@ -162,7 +272,8 @@ class SkillCreateSkill(BaseSkill):
                         file_path=str(file_path),
                         note="Skill file created. Auto-load is disabled; set ORBIT_ENABLE_SKILL_AUTOLOAD=1 to hot-load.",
                     )
-                loaded_name = self.registry.register_skill_from_file(str(file_path))
+                # Importing the new module compiles it and hits disk; keep that off the event loop.
+                loaded_name = await asyncio.to_thread(self.registry.register_skill_from_file, str(file_path))
 
             return SkillCreateOutput(
                 success=True,
@@ -3,7 +3,7 @@ Set-of-Mark (SoM) Vision Skill
 
 Implements the SoM prompting technique from Microsoft Research for precise UI grounding.
 Instead of asking "where is the button?", we:
-1. Detect all clickable elements using edge detection / contour analysis
+1. Detect all clickable elements using edge detection / connected-component analysis
 2. Overlay numbered labels on each element
 3. Ask the LLM "which label corresponds to X?"
 4. Use the known coordinates of that label
@@ -11,21 +11,51 @@ Instead of asking "where is the button?", we:
 This dramatically improves click accuracy from ~60% to ~95%+.
 """
 
+import asyncio
 import base64
+import functools
 import json
 import os
+import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import Type, Optional, List, Tuple
+from typing import Type, Optional, List, Tuple, Union
 from pydantic import BaseModel, Field
-from PIL import Image, ImageDraw, ImageFont
 import cv2
 import numpy as np
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from orbit_agent.skills.base import BaseSkill, SkillConfig
 from orbit_agent.models.openai_client import OpenAIClient
 from orbit_agent.models.base import Message
 
 
+_DET_CACHE_SIZE = 8
+# Longest side of the annotated image sent to the vision model.
+_LLM_MAX_SIDE = 1536
+_LABEL_CACHE_SIZE = 64
+
+_JSON_RE = re.compile(r"\{.*\}", re.S)
+
+# Label styling for annotated screenshots (BGR).
+_LABEL_BG = (0, 0, 255)
+_LABEL_FG = (255, 255, 255)
+_LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_LABEL_SCALE = 0.6
+_LABEL_THICKNESS = 2
+
+
+@functools.lru_cache(maxsize=256)
+def _label_size(label: str) -> Tuple[Tuple[int, int], int]:
+    """Text metrics per label string; labels repeat ("1".."N") across every annotation."""
+    return cv2.getTextSize(label, _LABEL_FONT, _LABEL_SCALE, _LABEL_THICKNESS)
+
+
 class SoMInput(BaseModel):
     image_path: str = Field(description="Absolute path to the screenshot to analyze.")
     target_description: str = Field(description="Description of the UI element to find (e.g., 'the Submit button').")
@@ -41,26 +71,58 @@ class SoMOutput(BaseModel):
     error: Optional[str] = None
 
 
+def _drop_nested(boxes: np.ndarray, areas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep only outermost boxes (what RETR_EXTERNAL contours gave us), e.g. drop a label's
+    glyph blobs that sit inside their button outline. Identical boxes keep the first.
+    """
+    if len(boxes) < 2:
+        return boxes, areas
+    x0, y0 = boxes[:, 0], boxes[:, 1]
+    x1, y1 = x0 + boxes[:, 2], y0 + boxes[:, 3]
+    inside = (
+        (x0[:, None] >= x0[None, :]) & (y0[:, None] >= y0[None, :])
+        & (x1[:, None] <= x1[None, :]) & (y1[:, None] <= y1[None, :])
+    )
+    idx = np.arange(len(boxes))
+    inside &= (areas[:, None] < areas[None, :]) | (idx[:, None] > idx[None, :])
+    outer = ~inside.any(axis=1)
+    return boxes[outer], areas[outer]
+
+
+def _usable_label(data: Optional[dict], elements: List[dict]) -> bool:
+    label = data.get("label") if data else None
+    return label is not None and any(e['id'] == label for e in elements)
+
+
 class UIElementDetector:
     """
     Detects UI elements using computer vision techniques.
-    Uses edge detection and contour analysis to find clickable regions.
+    Uses edge detection and connected-component analysis to find clickable regions.
     """
     
-    def __init__(self, min_area: int = 500, max_area: int = 100000):
+    def __init__(self, min_area: int = 500, max_area: int = 100000, max_side: int = 1280):
         self.min_area = min_area
         self.max_area = max_area
+        # Longest image side used for edge detection; larger screenshots are downscaled first.
+        self.max_side = max_side
     
-    def detect_elements(self, image_path: str, max_elements: int = 50) -> List[dict]:
+    def detect_elements(self, image_path: str, max_elements: int = 50) -> Tuple[List[dict], Optional[np.ndarray]]:
         """
-        Detect UI elements in the image using edge detection and contour analysis.
-        Returns list of dicts with 'id', 'bbox' (x, y, w, h), 'center' (x, y).
+        Detect UI elements in the image using edge detection and connected-component analysis.
+        Returns (elements, image) where elements are dicts with 'id', 'bbox' (x, y, w, h), 'center' (x, y)
+        and image is the decoded BGR screenshot (None if unreadable), reusable by annotate_image.
         """
         img = cv2.imread(image_path)
         if img is None:
-            return []
+            return [], None
         
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # Run edge detection on a bounded-size grayscale copy; boxes are mapped back to full resolution below.
+        h_img, w_img = img.shape[:2]
+        scale = min(1.0, self.max_side / max(h_img, w_img))
+        small = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else img
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        inv = 1.0 / scale
         
         # Apply edge detection
         edges = cv2.Canny(gray, 50, 150)
@@ -69,70 +131,66 @@ class UIElementDetector:
         kernel = np.ones((3, 3), np.uint8)
         dilated = cv2.dilate(edges, kernel, iterations=2)
         
-        # Find contours
-        contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        elements = []
-        for i, contour in enumerate(contours):
-            area = cv2.contourArea(contour)
-            if self.min_area < area < self.max_area:
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Filter out very thin or very wide elements (likely not buttons)
-                aspect_ratio = w / h if h > 0 else 0
-                if 0.2 < aspect_ratio < 10:
-                    elements.append({
-                        'id': len(elements) + 1,
-                        'bbox': [x, y, w, h],
-                        'center': [x + w // 2, y + h // 2],
-                        'area': area
-                    })
+        # Label connected edge blobs: one pass yields every component's bounding box, no contour tracing.
+        _, _, stats, _ = cv2.connectedComponentsWithStats(dilated, connectivity=8)
+        boxes = np.rint(stats[1:, :4] * inv).astype(np.int64)  # skip background; x, y, w, h at full resolution
+        areas = boxes[:, 2] * boxes[:, 3]
+        keep = (areas > self.min_area) & (areas < self.max_area)
+        boxes, areas = _drop_nested(boxes[keep], areas[keep])
         
-        # Sort by position (top-to-bottom, left-to-right) and limit
-        elements.sort(key=lambda e: (e['bbox'][1] // 50, e['bbox'][0]))
-        elements = elements[:max_elements]
+        # Filter out very thin or very wide elements (likely not buttons)
+        aspect = boxes[:, 2] / np.maximum(boxes[:, 3], 1)
+        keep = (aspect > 0.2) & (aspect < 10) & (boxes[:, 3] > 0)
+        boxes, areas = boxes[keep], areas[keep]
         
-        # Re-number after sorting
-        for i, elem in enumerate(elements):
-            elem['id'] = i + 1
+        # Sort by position (top-to-bottom in 50px rows, then left-to-right) and limit
+        order = np.lexsort((boxes[:, 0], boxes[:, 1] // 50))[:max_elements]
+        elements = [
+            {
+                'id': i,
+                'bbox': [x, y, w, h],
+                'center': [x + w // 2, y + h // 2],
+                'area': area
+            }
+            for i, ((x, y, w, h), area) in enumerate(zip(boxes[order].tolist(), areas[order].tolist()), start=1)
+        ]
         
-        return elements
+        return elements, img
     
-    def annotate_image(self, image_path: str, elements: List[dict], output_path: str) -> str:
+    def annotate_image(self, image: Union[str, np.ndarray], elements: List[dict], output_path: str) -> str:
         """
         Draw numbered labels on each detected element.
+        Accepts an image path or an already-decoded BGR array (which is drawn on in place).
         Returns the path to the annotated image.
         """
-        img = Image.open(image_path)
-        draw = ImageDraw.Draw(img)
-        
-        # Try to use a larger font, fallback to default
-        try:
-            font = ImageFont.truetype("arial.ttf", 16)
-        except:
-            font = ImageFont.load_default()
+        img = cv2.imread(image) if isinstance(image, str) else image
+        if img is None:
+            raise ValueError(f"Could not read image: {image}")
         
+        self.draw_labels(img, elements)
+        cv2.imwrite(output_path, img, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+        return output_path
+    
+    def draw_labels(self, img: np.ndarray, elements: List[dict], scale: float = 1.0) -> np.ndarray:
+        """
+        Draw numbered labels onto a BGR array in place and return it.
+        `scale` maps element bboxes (original-image coordinates) onto a resized `img`.
+        """
         for elem in elements:
-            x, y, w, h = elem['bbox']
+            x, y, w, h = (int(round(v * scale)) for v in elem['bbox'])
             label = str(elem['id'])
             
-            # Draw a semi-transparent rectangle
-            overlay_color = (255, 0, 0, 128)  # Red with alpha
-            
             # Draw border
-            draw.rectangle([x, y, x + w, y + h], outline='red', width=2)
+            cv2.rectangle(img, (x, y), (x + w, y + h), _LABEL_BG, 2)
             
             # Draw label background
-            label_x = x + 2
-            label_y = y + 2
-            bbox = draw.textbbox((label_x, label_y), label, font=font)
-            draw.rectangle([bbox[0] - 2, bbox[1] - 2, bbox[2] + 2, bbox[3] + 2], fill='red')
+            (tw, th), baseline = _label_size(label)
+            cv2.rectangle(img, (x, y), (x + tw + 6, y + th + baseline + 6), _LABEL_BG, cv2.FILLED)
             
             # Draw label text
-            draw.text((label_x, label_y), label, fill='white', font=font)
+            cv2.putText(img, label, (x + 3, y + th + 3), _LABEL_FONT, _LABEL_SCALE, _LABEL_FG, _LABEL_THICKNESS, cv2.LINE_AA)
         
-        img.save(output_path)
-        return output_path
+        return img
 
 
 class SoMVisionSkill(BaseSkill):
@@ -146,11 +204,22 @@ class SoMVisionSkill(BaseSkill):
     4. Return precise coordinates
     """
     
-    def __init__(self, api_key: str, model_name: str = "gpt-5.1"):
+    def __init__(self, api_key: str, model_name: str = "gpt-5.1", fast_model_name: Optional[str] = "gpt-4o-mini"):
         super().__init__()
         self.api_key = api_key
         self.client = OpenAIClient(api_key=self.api_key, model_name=model_name)
+        # Cheaper model tried first; None (or the same model) disables escalation.
+        self.fast_client = (
+            OpenAIClient(api_key=self.api_key, model_name=fast_model_name)
+            if fast_model_name and fast_model_name != model_name else None
+        )
         self.detector = UIElementDetector()
+        # (path, mtime_ns, size, max_elements) -> (elements, annotated_path, b64_image); agents often re-query
+        # the same screenshot for different targets, so the CV + encode pipeline only runs once per shot.
+        # The stat fingerprint stands in for a content hash: no need to read/hash megabytes per call.
+        self._det_cache: "OrderedDict[Tuple[str, int, int, int], Tuple[List[dict], Path, str]]" = OrderedDict()
+        # (screenshot fingerprint, normalized target description) -> label chosen by the LLM.
+        self._label_cache: "OrderedDict[Tuple[Tuple[str, int, int, int], str], int]" = OrderedDict()
     
     @property
     def default_config(self) -> SkillConfig:
@@ -168,31 +237,90 @@ class SoMVisionSkill(BaseSkill):
     def output_schema(self) -> Type[BaseModel]:
         return SoMOutput
     
+    async def _ask_label(self, client: OpenAIClient, messages: List[Message]) -> Tuple[str, Optional[dict]]:
+        """Query `client` and parse its {"label": ...} reply; returns (raw_text, parsed dict or None)."""
+        response = await client.generate(messages)
+        response_text = response.content.strip()
+        
+        # Grab the outermost {...} (works with or without markdown fences) in one scan.
+        m = _JSON_RE.search(response_text)
+        try:
+            if not m:
+                data = None
+            elif HAS_ORJSON:
+                data = orjson.loads(m.group(0))
+            else:
+                data = json.loads(m.group(0))
+        except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+            data = None
+        return response_text, (data if isinstance(data, dict) else None)
+    
     async def execute(self, inputs: SoMInput) -> SoMOutput:
         try:
             path = Path(inputs.image_path)
-            if not path.exists():
+            try:
+                st = os.stat(path)
+            except OSError:
                 return SoMOutput(success=False, error=f"Image not found: {inputs.image_path}")
             
-            # Step 1: Detect UI elements
-            elements = self.detector.detect_elements(str(path), inputs.max_elements)
-            
-            if not elements:
-                return SoMOutput(
-                    success=False, 
-                    error="No UI elements detected. The image may be empty or have unusual formatting."
-                )
+            det_key = (str(path), st.st_mtime_ns, st.st_size, inputs.max_elements)
+            cached = self._det_cache.get(det_key)
+            write_task = None
+            if cached is not None:
+                self._det_cache.move_to_end(det_key)
+                elements, annotated_path, b64_image = cached
+            else:
+                # Step 1: Detect UI elements
+                elements, img = self.detector.detect_elements(str(path), inputs.max_elements)
+                
+                if not elements:
+                    return SoMOutput(
+                        success=False, 
+                        error="No UI elements detected. The image may be empty or have unusual formatting."
+                    )
+                
+                # Step 2: Create annotated image
+                screenshots_dir = Path("screenshots")
+                screenshots_dir.mkdir(exist_ok=True)
+                annotated_path = screenshots_dir / f"som_annotated_{path.stem}.png"
+                # Send the model a token-efficient resolution; labels are drawn after the resize so they
+                # stay legible, and reported coordinates remain in original-image space.
+                h_img, w_img = img.shape[:2]
+                scale = min(1.0, _LLM_MAX_SIDE / max(h_img, w_img))
+                if scale < 1.0:
+                    img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                self.detector.draw_labels(img, elements, scale)
+                ok, buf = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+                if not ok:
+                    return SoMOutput(success=False, error="Failed to encode annotated image")
+                # Zero-copy view over the encoder's buffer, shared by the file write and the base64 encode.
+                png_view = memoryview(buf)
+                # Persist the annotated copy in the background while the LLM call is in flight.
+                write_task = asyncio.create_task(asyncio.to_thread(annotated_path.write_bytes, png_view))
+                b64_image = base64.b64encode(png_view).decode('ascii')
+                
+                self._det_cache[det_key] = (elements, annotated_path, b64_image)
+                if len(self._det_cache) > _DET_CACHE_SIZE:
+                    self._det_cache.popitem(last=False)
             
-            # Step 2: Create annotated image
-            screenshots_dir = Path("screenshots")
-            screenshots_dir.mkdir(exist_ok=True)
-            annotated_path = screenshots_dir / f"som_annotated_{path.stem}.png"
-            self.detector.annotate_image(str(path), elements, str(annotated_path))
+            # Same annotated image + same target => same answer; skip the vision call entirely.
+            label_key = (det_key, " ".join(inputs.target_description.lower().split()))
+            cached_label = self._label_cache.get(label_key)
+            if cached_label is not None:
+                target_element = next((e for e in elements if e['id'] == cached_label), None)
+                if target_element is not None:
+                    self._label_cache.move_to_end(label_key)
+                    if write_task is not None:
+                        await write_task
+                    return SoMOutput(
+                        success=True,
+                        coordinates=target_element['center'],
+                        label_selected=cached_label,
+                        annotated_image_path=str(annotated_path),
+                        all_elements=elements
+                    )
             
             # Step 3: Send to LLM for identification
-            with open(annotated_path, "rb") as img_file:
-                b64_image = base64.b64encode(img_file.read()).decode('utf-8')
-            
             prompt = f"""You are looking at a screenshot with numbered red labels overlaid on UI elements.
 
 Find the element that matches this description: "{inputs.target_description}"
@@ -216,32 +344,28 @@ If the element is not visible or no label matches, respond: {{"label": null, "re
             ]
             
             messages = [Message(role="user", content=content)]
-            response = await self.client.generate(messages)
-            
-            # Step 4: Parse LLM response
-            response_text = response.content.strip()
-            
-            # Clean markdown if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
             try:
-                data = json.loads(response_text)
-            except json.JSONDecodeError:
-                # Try to extract JSON from response
-                start = response_text.find("{")
-                end = response_text.rfind("}") + 1
-                if start != -1 and end > start:
-                    data = json.loads(response_text[start:end])
-                else:
-                    return SoMOutput(
-                        success=False,
-                        error=f"Could not parse LLM response: {response_text}",
-                        annotated_image_path=str(annotated_path),
-                        all_elements=elements
-                    )
+                # Step 4: Ask the fast model first; with labels drawn on, this is mostly "read the number".
+                # Escalate to the main model if the call fails, or the answer is unusable or finds nothing.
+                data = None
+                if self.fast_client is not None:
+                    try:
+                        response_text, data = await self._ask_label(self.fast_client, messages)
+                    except Exception:
+                        pass  # e.g. no access to the fast model, 404/429: the main model answers instead
+                if not _usable_label(data, elements):
+                    response_text, data = await self._ask_label(self.client, messages)
+            finally:
+                if write_task is not None:
+                    await write_task
+            
+            if not isinstance(data, dict):
+                return SoMOutput(
+                    success=False,
+                    error=f"Could not parse LLM response: {response_text}",
+                    annotated_image_path=str(annotated_path),
+                    all_elements=elements
+                )
             
             label = data.get("label")
             
@@ -264,6 +388,10 @@ If the element is not visible or no label matches, respond: {{"label": null, "re
                     all_elements=elements
                 )
             
+            self._label_cache[label_key] = label
+            if len(self._label_cache) > _LABEL_CACHE_SIZE:
+                self._label_cache.popitem(last=False)
+            
             return SoMOutput(
                 success=True,
                 coordinates=target_element['center'],
@@ -13,15 +13,192 @@ This is usually more reliable than pure text replacement because:
 """
 
 import asyncio
+import contextlib
+import io
+import os
+import re
+import stat
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Type, Optional, List
+from typing import Type, Optional, List, Tuple
+import numpy as np
 from pydantic import BaseModel, Field
-import aiofiles
 from enum import Enum
 
 
 from orbit_agent.skills.base import BaseSkill, SkillConfig
 
+# Files kept in memory for repeated view/search between edits
+_FILE_CACHE_SIZE = 32
+# Larger files keep only their line index; views read just the bytes they show
+_MAX_CACHED_BYTES = 10 * 1024 * 1024
+
+
+def _content_lines(text: str) -> List[str]:
+    """Split new content into newline-terminated lines (empty text is one blank line)."""
+    # newline='' splits on \n, \r\n and \r only (like reading the file back) and keeps the endings;
+    # str.splitlines would also break on \x0b, \x0c, \x1c-\x1e, \x85, \u2028 and \u2029.
+    new_lines = io.StringIO(text, newline='').readlines()
+    if not new_lines:
+        return ['\n']
+    if not new_lines[-1].endswith(('\n', '\r')):
+        new_lines[-1] += '\n'
+    return new_lines
+
+
+def _sync_read_lines(path: Path) -> List[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+
+def _sync_write_lines(path: Path, lines: List[str]) -> None:
+    """Write lines to a temp file next to the target and rename it over, so a crash never leaves a half-written file."""
+    target = os.path.realpath(path)  # replace the file a symlink points at, not the link
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.' + os.path.basename(target) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        os.chmod(tmp, stat.S_IMODE(os.stat(target).st_mode))
+        os.replace(tmp, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+# Read-modify-write helpers run in one thread hop. They return
+# (total before, total after); total after is None when the range was
+# invalid and nothing was written.
+def _sync_edit(path: Path, start: int, end: int, new_lines: List[str]) -> Tuple[int, Optional[int]]:
+    lines = _sync_read_lines(path)
+    total = len(lines)
+    if start < 0 or end > total or start >= end:
+        return total, None
+    lines[start:end] = new_lines
+    _sync_write_lines(path, lines)
+    return total, len(lines)
+
+
+def _sync_insert(path: Path, insert_pos: int, new_lines: List[str]) -> Tuple[int, Optional[int]]:
+    lines = _sync_read_lines(path)
+    total = len(lines)
+    lines[insert_pos:insert_pos] = new_lines
+    _sync_write_lines(path, lines)
+    return total, len(lines)
+
+
+def _sync_delete(path: Path, start: int, end: int) -> Tuple[int, Optional[int]]:
+    lines = _sync_read_lines(path)
+    total = len(lines)
+    if start < 0 or end > total or start >= end:
+        return total, None
+    del lines[start:end]
+    _sync_write_lines(path, lines)
+    return total, len(lines)
+
+
+def _collect_matches(buf, offsets, context_lines: int) -> Tuple[int, List[int], List[str]]:
+    """
+    Turn match offsets into numbered context blocks.
+
+    Works on either bytes or str; line numbers are counted incrementally
+    between matches and only the context window around each hit is decoded.
+    """
+    nl = b'\n' if isinstance(buf, bytes) else '\n'
+    size = len(buf)
+    total = buf.count(nl) + (1 if buf and not buf.endswith(nl) else 0)
+    
+    matched_lines = []
+    matches = []
+    line_no = 0
+    pos = 0
+    for off in offsets:
+        line_no += buf.count(nl, pos, off)
+        pos = off
+        if matched_lines and matched_lines[-1] == line_no + 1:
+            continue  # another hit on the same line
+        matched_lines.append(line_no + 1)
+        
+        first = line_no
+        begin = buf.rfind(nl, 0, off) + 1
+        for _ in range(context_lines):
+            if begin == 0:
+                break
+            begin = buf.rfind(nl, 0, begin - 1) + 1
+            first -= 1
+        
+        stop = buf.find(nl, off)
+        if stop == -1:
+            stop = size
+        for _ in range(context_lines):
+            if stop >= size - 1:
+                break
+            nxt = buf.find(nl, stop + 1)
+            stop = size if nxt == -1 else nxt
+        
+        segment = buf[begin:stop]
+        if isinstance(segment, bytes):
+            segment = segment.decode('utf-8', errors='replace')
+        matches.append("\n".join(
+            f"{j:4d} {'>>> ' if j == line_no + 1 else '    '}{line.rstrip()}"
+            for j, line in enumerate(segment.split('\n'), start=first + 1)
+        ))
+    
+    return total, matched_lines, matches
+
+
+def _decode_lines(data: bytes) -> List[str]:
+    # Display only, so a stray invalid byte shows as U+FFFD instead of failing the view.
+    # StringIO with newline=None translates line endings like text-mode open().
+    return io.StringIO(data.decode('utf-8', errors='replace'), newline=None).readlines()
+
+
+def _line_starts(data: bytes) -> np.ndarray:
+    """Byte offset of every line start, splitting on \\n, \\r\\n and bare \\r like text mode."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    lf = buf == 0x0A
+    cr = buf == 0x0D
+    cr[:-1] &= ~lf[1:]  # CR followed by LF ends the line at the LF
+    starts = np.concatenate(([0], np.flatnonzero(lf | cr) + 1))
+    if starts[-1] == len(data):
+        starts = starts[:-1]  # trailing newline does not open another line
+    return starts
+
+
+def _sync_line_starts(path: str) -> np.ndarray:
+    with open(path, 'rb') as f:
+        return _line_starts(f.read())
+
+
+def _sync_read_range(path: str, lo: int, hi: int) -> bytes:
+    with open(path, 'rb') as f:
+        f.seek(lo)
+        return f.read(hi - lo)
+
+
+def _search_blob(data: bytes, pattern: str, context_lines: int) -> Tuple[int, List[int], List[str]]:
+    # Same line breaks as view/edit (\n, \r\n and bare \r); _collect_matches then only counts \n.
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    try:
+        needle = pattern.lower().encode('ascii')
+    except UnicodeEncodeError:
+        # bytes.lower() only folds ASCII, so non-ASCII patterns search the decoded text
+        text = data.decode('utf-8')
+        pattern_re = re.compile(re.escape(pattern), re.IGNORECASE)
+        return _collect_matches(text, (m.start() for m in pattern_re.finditer(text)), context_lines)
+    
+    haystack = data.lower()
+    
+    def offsets():
+        off = haystack.find(needle)
+        while off != -1:
+            yield off
+            off = haystack.find(needle, off + 1)
+    
+    return _collect_matches(data, offsets(), context_lines)
+
 
 class EditAction(str, Enum):
     VIEW = "view"           # View file with line numbers
@@ -60,6 +237,11 @@ class StructuredEditSkill(BaseSkill):
     - Search with context
     """
     
+    def __init__(self, config: Optional[SkillConfig] = None):
+        super().__init__(config)
+        # abspath -> [(mtime_ns, size), raw bytes (None if too large), line start offsets or None]
+        self._cache: OrderedDict[str, list] = OrderedDict()
+    
     @property
     def default_config(self) -> SkillConfig:
         return SkillConfig(
@@ -92,6 +274,36 @@ class StructuredEditSkill(BaseSkill):
         else:
             return StructuredEditOutput(success=False, error=f"Unknown action: {inputs.action}")
     
+    async def _cached_entry(self, path: Path) -> list:
+        """Return the cache entry for path, re-reading only if mtime or size changed."""
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._cache.move_to_end(key)
+            return entry
+        
+        if st.st_size == 0:
+            entry = [stamp, b'', np.zeros(0, dtype=np.int64)]
+        elif st.st_size > _MAX_CACHED_BYTES:
+            entry = [stamp, None, await asyncio.to_thread(_sync_line_starts, key)]
+        else:
+            entry = [stamp, await asyncio.to_thread(Path(key).read_bytes), None]
+        self._cache[key] = entry
+        if len(self._cache) > _FILE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return entry
+    
+    async def _cached_index(self, path: Path) -> list:
+        entry = await self._cached_entry(path)
+        if entry[2] is None:
+            entry[2] = await asyncio.to_thread(_line_starts, entry[1])
+        return entry
+    
+    def _invalidate(self, path: Path) -> None:
+        self._cache.pop(os.path.abspath(path), None)
+    
     async def _view_file(
         self, 
         path: Path, 
@@ -99,14 +311,10 @@ class StructuredEditSkill(BaseSkill):
         end_line: Optional[int] = None
     ) -> StructuredEditOutput:
         """View file with line numbers."""
-        if not path.exists():
-            return StructuredEditOutput(success=False, error=f"File not found: {path}")
-        
         try:
-            async with aiofiles.open(path, mode='r', encoding='utf-8') as f:
-                lines = await f.readlines()
+            (_, size), data, starts = await self._cached_index(path)
             
-            total = len(lines)
+            total = len(starts)
             start = (start_line or 1) - 1  # Convert to 0-indexed
             end = end_line or total
             
@@ -114,12 +322,17 @@ class StructuredEditSkill(BaseSkill):
             start = max(0, min(start, total - 1))
             end = max(start + 1, min(end, total))
             
-            # Format with line numbers
-            numbered_lines = []
-            for i, line in enumerate(lines[start:end], start=start + 1):
-                numbered_lines.append(f"{i:4d} | {line.rstrip()}")
+            # Decode only the requested lines
+            lo = int(starts[start]) if start < total else size
+            hi = int(starts[end]) if end < total else size
+            if data is None:
+                segment = await asyncio.to_thread(_sync_read_range, os.path.abspath(path), lo, hi)
+            else:
+                segment = data[lo:hi]
+            lines = _decode_lines(segment)
             
-            content = "\n".join(numbered_lines)
+            # Format with line numbers
+            content = "\n".join(f"{i:4d} | {line.rstrip()}" for i, line in enumerate(lines, start=start + 1))
             
             return StructuredEditOutput(
                 success=True,
@@ -128,6 +341,8 @@ class StructuredEditSkill(BaseSkill):
                 lines_affected=list(range(start + 1, end + 1))
             )
             
+        except FileNotFoundError:
+            return StructuredEditOutput(success=False, error=f"File not found: {path}")
         except Exception as e:
             return StructuredEditOutput(success=False, error=str(e))
     
@@ -139,9 +354,6 @@ class StructuredEditSkill(BaseSkill):
         new_content: Optional[str]
     ) -> StructuredEditOutput:
         """Replace lines between start_line and end_line with new_content."""
-        if not path.exists():
-            return StructuredEditOutput(success=False, error=f"File not found: {path}")
-        
         if start_line is None or end_line is None:
             return StructuredEditOutput(success=False, error="start_line and end_line are required for edit")
         
@@ -149,38 +361,29 @@ class StructuredEditSkill(BaseSkill):
             return StructuredEditOutput(success=False, error="new_content is required for edit")
         
         try:
-            async with aiofiles.open(path, mode='r', encoding='utf-8') as f:
-                lines = await f.readlines()
-            
-            total = len(lines)
             start = start_line - 1  # 0-indexed
             end = end_line  # end_line is inclusive, so we use it directly for slicing
             
-            if start < 0 or end > total or start >= end:
+            new_lines = _content_lines(new_content)
+            
+            total, new_total = await asyncio.to_thread(_sync_edit, path, start, end, new_lines)
+            self._invalidate(path)
+            
+            if new_total is None:
                 return StructuredEditOutput(
                     success=False, 
                     error=f"Invalid line range: {start_line}-{end_line} (file has {total} lines)"
                 )
             
-            # Create new content lines
-            new_lines = new_content.split('\n')
-            # Ensure each line ends with newline except possibly the last
-            new_lines = [line + '\n' if not line.endswith('\n') else line for line in new_lines]
-            
-            # Replace the lines
-            lines[start:end] = new_lines
-            
-            # Write back
-            async with aiofiles.open(path, mode='w', encoding='utf-8') as f:
-                await f.writelines(lines)
-            
             return StructuredEditOutput(
                 success=True,
                 content=f"Replaced lines {start_line}-{end_line} with {len(new_lines)} new lines",
-                total_lines=len(lines),
+                total_lines=new_total,
                 lines_affected=list(range(start_line, start_line + len(new_lines)))
             )
             
+        except FileNotFoundError:
+            return StructuredEditOutput(success=False, error=f"File not found: {path}")
         except Exception as e:
             return StructuredEditOutput(success=False, error=str(e))
     
@@ -191,9 +394,6 @@ class StructuredEditSkill(BaseSkill):
         new_content: Optional[str]
     ) -> StructuredEditOutput:
         """Insert new_content after after_line."""
-        if not path.exists():
-            return StructuredEditOutput(success=False, error=f"File not found: {path}")
-        
         if after_line is None:
             return StructuredEditOutput(success=False, error="start_line (insert after) is required")
         
@@ -201,31 +401,23 @@ class StructuredEditSkill(BaseSkill):
             return StructuredEditOutput(success=False, error="new_content is required")
         
         try:
-            async with aiofiles.open(path, mode='r', encoding='utf-8') as f:
-                lines = await f.readlines()
-            
             # Insert position (0-indexed, after the specified line)
             insert_pos = after_line  # after_line is 1-indexed, so this inserts after that line
             
-            # Create new content lines
-            new_lines = new_content.split('\n')
-            new_lines = [line + '\n' if not line.endswith('\n') else line for line in new_lines]
+            new_lines = _content_lines(new_content)
             
-            # Insert
-            for i, line in enumerate(new_lines):
-                lines.insert(insert_pos + i, line)
-            
-            # Write back
-            async with aiofiles.open(path, mode='w', encoding='utf-8') as f:
-                await f.writelines(lines)
+            _, new_total = await asyncio.to_thread(_sync_insert, path, insert_pos, new_lines)
+            self._invalidate(path)
             
             return StructuredEditOutput(
                 success=True,
                 content=f"Inserted {len(new_lines)} lines after line {after_line}",
-                total_lines=len(lines),
+                total_lines=new_total,
                 lines_affected=list(range(after_line + 1, after_line + 1 + len(new_lines)))
             )
             
+        except FileNotFoundError:
+            return StructuredEditOutput(success=False, error=f"File not found: {path}")
         except Exception as e:
             return StructuredEditOutput(success=False, error=str(e))
     
@@ -236,38 +428,32 @@ class StructuredEditSkill(BaseSkill):
         end_line: Optional[int]
     ) -> StructuredEditOutput:
         """Delete lines from start_line to end_line (inclusive)."""
-        if not path.exists():
-            return StructuredEditOutput(success=False, error=f"File not found: {path}")
-        
         if start_line is None or end_line is None:
             return StructuredEditOutput(success=False, error="start_line and end_line are required")
         
         try:
-            async with aiofiles.open(path, mode='r', encoding='utf-8') as f:
-                lines = await f.readlines()
-            
-            total = len(lines)
             start = start_line - 1
             end = end_line
             
-            if start < 0 or end > total or start >= end:
+            _, new_total = await asyncio.to_thread(_sync_delete, path, start, end)
+            self._invalidate(path)
+            
+            if new_total is None:
                 return StructuredEditOutput(
                     success=False, 
                     error=f"Invalid line range: {start_line}-{end_line}"
                 )
             
             deleted_count = end - start
-            del lines[start:end]
-            
-            async with aiofiles.open(path, mode='w', encoding='utf-8') as f:
-                await f.writelines(lines)
             
             return StructuredEditOutput(
                 success=True,
                 content=f"Deleted {deleted_count} lines ({start_line}-{end_line})",
-                total_lines=len(lines)
+                total_lines=new_total
             )
             
+        except FileNotFoundError:
+            return StructuredEditOutput(success=False, error=f"File not found: {path}")
         except Exception as e:
             return StructuredEditOutput(success=False, error=str(e))
     
@@ -278,39 +464,22 @@ class StructuredEditSkill(BaseSkill):
         context_lines: int = 3
     ) -> StructuredEditOutput:
         """Search for pattern in file, showing context around matches."""
-        if not path.exists():
-            return StructuredEditOutput(success=False, error=f"File not found: {path}")
-        
         if not pattern:
             return StructuredEditOutput(success=False, error="pattern is required for search")
         
         try:
-            async with aiofiles.open(path, mode='r', encoding='utf-8') as f:
-                lines = await f.readlines()
-            
-            matches = []
-            matched_lines = []
-            
-            for i, line in enumerate(lines):
-                if pattern.lower() in line.lower():
-                    matched_lines.append(i + 1)
-                    
-                    # Get context
-                    start = max(0, i - context_lines)
-                    end = min(len(lines), i + context_lines + 1)
-                    
-                    context = []
-                    for j in range(start, end):
-                        prefix = ">>> " if j == i else "    "
-                        context.append(f"{j + 1:4d} {prefix}{lines[j].rstrip()}")
-                    
-                    matches.append("\n".join(context))
+            data = (await self._cached_entry(path))[1]
+            if data is None:
+                data = await asyncio.to_thread(Path(os.path.abspath(path)).read_bytes)
+            total, matched_lines, matches = await asyncio.to_thread(
+                _search_blob, data, pattern, context_lines
+            )
             
             if not matches:
                 return StructuredEditOutput(
                     success=True,
                     content=f"No matches found for '{pattern}'",
-                    total_lines=len(lines)
+                    total_lines=total
                 )
             
             content = f"Found {len(matches)} matches for '{pattern}':\n\n" + "\n---\n".join(matches)
@@ -318,9 +487,11 @@ class StructuredEditSkill(BaseSkill):
             return StructuredEditOutput(
                 success=True,
                 content=content,
-                total_lines=len(lines),
+                total_lines=total,
                 lines_affected=matched_lines
             )
             
+        except FileNotFoundError:
+            return StructuredEditOutput(success=False, error=f"File not found: {path}")
         except Exception as e:
             return StructuredEditOutput(success=False, error=str(e))
@@ -1,7 +1,19 @@
+import asyncio
 import base64
+import os
+import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import Type, Optional, List, Dict, Any, Literal
+from typing import Type, Optional, List, Dict, Any, Literal, Tuple
 from pydantic import BaseModel, Field
+import cv2
+import numpy as np
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from orbit_agent.skills.base import BaseSkill, SkillConfig
 from orbit_agent.models.openai_client import OpenAIClient
@@ -11,6 +23,73 @@ from orbit_agent.config.config import OrbitConfig
 import json
 from enum import Enum
 
+# Encoded screenshots kept for follow-up queries on the same file
+_IMAGE_CACHE_SIZE = 4
+_RESPONSE_CACHE_SIZE = 128
+# Screenshots larger than this (longest side) are downscaled and sent as JPEG
+_MAX_IMAGE_SIDE = 1568
+_JPEG_QUALITY = 85
+# Outermost {...} in a LOCATE reply, with or without markdown fences around it
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+# LOCATE prompt, split around the query so each call is a plain concatenation
+_LOCATE_PROMPT_HEAD = "LOCATE the element described as: '"
+_LOCATE_PROMPT_TAIL = """'.
+
+CRITICAL INSTRUCTION:
+- Find the PRIMARY functional element matching the description.
+- Ignore small icons, profile pictures, or status indicators unless explicitly asked for.
+- If there are multiple matches, choose the most prominent/center one (e.g. the main 'Play' button, not a small play icon in a list).
+
+Return a strictly valid JSON object with the 'box_2d' key containing the [ymin, xmin, ymax, xmax] coordinates.
+Example: { "box_2d": [100, 200, 150, 300] }
+
+Do not add markdown code blocks. Just the JSON.
+"""
+
+# One OpenAIClient (and its connection pool) per (api_key, model) across VisionSkill instances
+_CLIENTS: Dict[Tuple[str, str], OpenAIClient] = {}
+
+
+def _shared_client(api_key: str, model_name: str) -> OpenAIClient:
+    client = _CLIENTS.get((api_key, model_name))
+    if client is None:
+        client = _CLIENTS[(api_key, model_name)] = OpenAIClient(api_key=api_key, model_name=model_name)
+    return client
+
+
+def _sniff_mime(raw: bytes) -> str:
+    if raw[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if raw[:4] == b"RIFF" and raw[8:12] == b"WEBP":
+        return "image/webp"
+    if raw[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "image/png"
+
+
+def _read_and_b64(path: Path) -> Tuple[str, str, float, float]:
+    """
+    Load an image for the vision model; returns (base64, mime, scale_x, scale_y).
+
+    The scales map coordinates in the sent image back to the original file.
+    """
+    with open(path, "rb") as image_file:
+        raw = image_file.read()
+    img = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is not None:
+        h, w = img.shape[:2]
+        if max(h, w) > _MAX_IMAGE_SIDE:
+            factor = _MAX_IMAGE_SIDE / max(h, w)
+            new_w, new_h = max(1, round(w * factor)), max(1, round(h * factor))
+            small = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA)
+            ok, buf = cv2.imencode(".jpg", small, [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY])
+            if ok:
+                return base64.b64encode(buf).decode('ascii'), "image/jpeg", w / new_w, h / new_h
+    return base64.b64encode(raw).decode('ascii'), _sniff_mime(raw), 1.0, 1.0
+
+
 class VisionMode(str, Enum):
     DESCRIBE = "describe"
     LOCATE = "locate"
@@ -23,6 +102,10 @@ class VisionInput(BaseModel):
         default=None,
         description="Optional assertion. If set, the model must answer YES/NO and the skill will fail if it doesn't match."
     )
+    detail: Optional[Literal["low", "high", "auto"]] = Field(
+        default=None,
+        description="Optional image detail level for the vision model ('low' is much cheaper). Defaults to the API default."
+    )
 
 class VisionOutput(BaseModel):
     success: bool = True
@@ -35,7 +118,11 @@ class VisionSkill(BaseSkill):
         super().__init__()
         self.api_key = api_key
         # Use the same model as the main agent by default (configurable via SkillRegistry).
-        self.client = OpenAIClient(api_key=self.api_key, model_name=model_name)
+        self.client = _shared_client(self.api_key, model_name)
+        # (path, mtime_ns, size) -> _read_and_b64 result, so LOCATE + DESCRIBE on one shot encode once
+        self._image_cache: OrderedDict[tuple, Tuple[str, str, float, float]] = OrderedDict()
+        # (image key, prompt, mode, detail) -> (reply text, scale_x, scale_y) for repeated questions
+        self._response_cache: OrderedDict[tuple, Tuple[str, float, float]] = OrderedDict()
 
     @property
     def default_config(self) -> SkillConfig:
@@ -53,20 +140,72 @@ class VisionSkill(BaseSkill):
     def output_schema(self) -> Type[BaseModel]:
         return VisionOutput
 
+    async def _encoded_image(self, path: Path, key: tuple) -> Tuple[str, str, float, float]:
+        cached = self._image_cache.get(key)
+        if cached is not None:
+            self._image_cache.move_to_end(key)
+            return cached
+        encoded = await asyncio.to_thread(_read_and_b64, path)
+        self._image_cache[key] = encoded
+        if len(self._image_cache) > _IMAGE_CACHE_SIZE:
+            self._image_cache.popitem(last=False)
+        return encoded
+
+    def _interpret(self, inputs: VisionInput, text_response: str, scale_x: float, scale_y: float) -> VisionOutput:
+        """Turn the model's reply into a VisionOutput for the requested mode."""
+        # Assertion mode (YES/NO) for DESCRIBE
+        if inputs.expect is not None and inputs.mode != VisionMode.LOCATE:
+            lower = text_response.lower()
+            got = "yes" if "yes" in lower else ("no" if "no" in lower else None)
+            if got is None:
+                return VisionOutput(success=False, analysis=text_response, error="Expected YES/NO but could not parse answer.")
+            ok = (got == inputs.expect)
+            return VisionOutput(success=ok, analysis=text_response, error=None if ok else f"Expected {inputs.expect.upper()} but got {got.upper()}.")
+        
+        # Parse output if LOCATE
+        if inputs.mode == VisionMode.LOCATE:
+            try:
+                match = _JSON_OBJ_RE.search(text_response)
+                if match is None:
+                    raise ValueError("Invalid JSON in location response")
+                data = orjson.loads(match.group()) if HAS_ORJSON else json.loads(match.group())
+
+                box = data.get("box_2d")
+                # Support old format just in case
+                point = data.get("point")
+                
+                if box and len(box) == 4:
+                    ymin, xmin, ymax, xmax = box
+                    # Calculate Center, mapped back to original image pixels
+                    center_x = int((xmin + xmax) / 2 * scale_x)
+                    center_y = int((ymin + ymax) / 2 * scale_y)
+                    return VisionOutput(success=True, analysis=f"Located box {box}, center at {center_x},{center_y}", coordinates=[center_x, center_y])
+                    
+                elif point and len(point) == 2:
+                     if scale_x != 1.0 or scale_y != 1.0:
+                         point = [int(point[0] * scale_x), int(point[1] * scale_y)]
+                     return VisionOutput(success=True, analysis=f"Located point at {point}", coordinates=point)
+                else:
+                    return VisionOutput(success=False, analysis=text_response, error="JSON parsed but no 'box_2d' or 'point' found")
+            except Exception as e:
+                return VisionOutput(success=False, analysis=text_response, error=f"Failed to parse location JSON: {e}")
+
+        return VisionOutput(success=True, analysis=text_response)
+
     async def execute(self, inputs: VisionInput) -> VisionOutput:
         try:
             path = Path(inputs.image_path)
-            if not path.exists():
-                # Fallback: Check in screenshots folder
-                fallback = Path("screenshots") / path.name
-                if fallback.exists():
-                    path = fallback
-                else:
-                    return VisionOutput(success=False, analysis="", error=f"Image not found at {inputs.image_path} or {fallback}")
-            
-            # Encode image
-            with open(path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+            fallback = Path("screenshots") / path.name
+            # Bare filenames almost always refer to screenshots/, so probe that first
+            candidates = (fallback, path) if path.parent == Path(".") and not path.is_absolute() else (path, fallback)
+            for path in candidates:
+                try:
+                    st = os.stat(path)
+                    break
+                except OSError:
+                    continue
+            else:
+                return VisionOutput(success=False, analysis="", error=f"Image not found at {inputs.image_path} or {fallback}")
             
             # Use 'describe' logic by default
             prompt_text = inputs.query
@@ -78,27 +217,26 @@ class VisionSkill(BaseSkill):
             
             # If LOCATE mode, override prompt
             if inputs.mode == VisionMode.LOCATE:
-                prompt_text = f"""
-                LOCATE the element described as: '{inputs.query}'.
-                
-                CRITICAL INSTRUCTION:
-                - Find the PRIMARY functional element matching the description.
-                - Ignore small icons, profile pictures, or status indicators unless explicitly asked for.
-                - If there are multiple matches, choose the most prominent/center one (e.g. the main 'Play' button, not a small play icon in a list).
-                
-                Return a strictly valid JSON object with the 'box_2d' key containing the [ymin, xmin, ymax, xmax] coordinates.
-                Example: {{ "box_2d": [100, 200, 150, 300] }}
-                
-                Do not add markdown code blocks. Just the JSON.
-                """
+                prompt_text = _LOCATE_PROMPT_HEAD + inputs.query + _LOCATE_PROMPT_TAIL
 
+            image_key = (str(path), st.st_mtime_ns, st.st_size)
+            response_key = (image_key, prompt_text, inputs.mode, inputs.detail)
+            cached = self._response_cache.get(response_key)
+            if cached is not None:
+                self._response_cache.move_to_end(response_key)
+                return self._interpret(inputs, *cached)
+            
+            # Encode image
+            base64_image, mime, scale_x, scale_y = await self._encoded_image(path, image_key)
+            
+            image_url = {"url": f"data:{mime};base64,{base64_image}"}
+            if inputs.detail is not None:
+                image_url["detail"] = inputs.detail
             content = [
                 {"type": "text", "text": prompt_text},
                 {
                     "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/png;base64,{base64_image}"
-                    }
+                    "image_url": image_url
                 }
             ]
             
@@ -108,51 +246,14 @@ class VisionSkill(BaseSkill):
             
             response = await self.client.generate(messages)
             text_response = response.content.strip()
-
-            # Assertion mode (YES/NO) for DESCRIBE
-            if inputs.expect is not None and inputs.mode != VisionMode.LOCATE:
-                lower = text_response.lower()
-                got = "yes" if "yes" in lower else ("no" if "no" in lower else None)
-                if got is None:
-                    return VisionOutput(success=False, analysis=text_response, error="Expected YES/NO but could not parse answer.")
-                ok = (got == inputs.expect)
-                return VisionOutput(success=ok, analysis=text_response, error=None if ok else f"Expected {inputs.expect.upper()} but got {got.upper()}.")
+            result = self._interpret(inputs, text_response, scale_x, scale_y)
             
-            # Parse output if LOCATE
-            if inputs.mode == VisionMode.LOCATE:
-                try:
-                    # Cleanup markdown if present
-                    clean_text = text_response.replace("```json", "").replace("```", "").strip()
-                    try:
-                        data = json.loads(clean_text)
-                    except json.JSONDecodeError:
-                        # Attempt to find JSON within the response if it's not strictly JSON
-                        start = clean_text.find("{")
-                        end = clean_text.rfind("}")
-                        if start != -1 and end != -1 and start < end:
-                            data = json.loads(clean_text[start : end + 1])
-                        else:
-                            raise ValueError("Invalid JSON in location response")
-
-                    box = data.get("box_2d")
-                    # Support old format just in case
-                    point = data.get("point")
-                    
-                    if box and len(box) == 4:
-                        ymin, xmin, ymax, xmax = box
-                        # Calculate Center
-                        center_x = int((xmin + xmax) / 2)
-                        center_y = int((ymin + ymax) / 2)
-                        return VisionOutput(success=True, analysis=f"Located box {box}, center at {center_x},{center_y}", coordinates=[center_x, center_y])
-                        
-                    elif point and len(point) == 2:
-                         return VisionOutput(success=True, analysis=f"Located point at {point}", coordinates=point)
-                    else:
-                        return VisionOutput(success=False, analysis=text_response, error="JSON parsed but no 'box_2d' or 'point' found")
-                except Exception as e:
-                    return VisionOutput(success=False, analysis=text_response, error=f"Failed to parse location JSON: {e}")
-
-            return VisionOutput(success=True, analysis=text_response)
+            # Only answers that worked are reused; failures get a fresh try
+            if result.success:
+                self._response_cache[response_key] = (text_response, scale_x, scale_y)
+                if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+            return result
  
         except Exception as e:
             return VisionOutput(success=False, analysis="", error=str(e))
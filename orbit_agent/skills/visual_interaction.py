@@ -1,14 +1,75 @@
-from typing import Type, Literal, Optional
+from typing import Dict, Type, Literal, Optional, Tuple
 from pydantic import BaseModel, Field
 import asyncio
 import os
+import random
+
+import cv2
+import pyautogui
 
 from orbit_agent.skills.base import BaseSkill, SkillConfig
-from orbit_agent.skills.vision import VisionSkill, VisionInput, VisionMode
-from orbit_agent.skills.som_vision import SoMVisionSkill, SoMInput
+from orbit_agent.skills.vision import VisionSkill, VisionInput, VisionMode, VisionOutput
+from orbit_agent.skills.som_vision import SoMVisionSkill, SoMInput, SoMOutput
 from orbit_agent.skills.desktop import DesktopSkill, DesktopInput, DesktopOutput
 from orbit_agent.memory.ui_cache import UICache
 
+# Full-screen DESCRIBE checks are downscaled to this longest side
+_VISION_MAX_EDGE = 1024
+# Side of the square cut around the cursor for hover/confirm checks
+_CROP_SIZE = 512
+# Prepared copies are lossy WebP: a fraction of PNG's size, no visible loss for UI checks
+_WEBP_QUALITY = 80
+# Vision/SoM API calls in flight at once per skill; more mostly buys 429s and retries
+_VISION_CONCURRENCY = 5
+# Upper bound of the random delay for calls that had to wait, so released waiters don't fire in lockstep
+_VISION_JITTER_S = 0.2
+
+# SoM skills (clients + detection/label caches) shared by every VisualInteractionSkill
+_SOM_CACHE: Dict[Tuple[str, str], SoMVisionSkill] = {}
+
+
+def _shared_som_skill(api_key: str, model_name: str) -> SoMVisionSkill:
+    skill = _SOM_CACHE.get((api_key, model_name))
+    if skill is None:
+        skill = _SOM_CACHE[(api_key, model_name)] = SoMVisionSkill(api_key, model_name=model_name)
+    return skill
+
+
+def _prepare_vision_image(
+    path: str,
+    crop_center: Optional[Tuple[int, int]] = None,
+    max_edge: int = _VISION_MAX_EDGE,
+) -> str:
+    """
+    Write a smaller WebP copy of a screenshot for a DESCRIBE check and return its path.
+
+    With crop_center, cuts a _CROP_SIZE square around that point (clamped to the
+    image); otherwise downscales to max_edge. Returns the original path if the
+    image can't be read or is already small enough.
+    """
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    if img is None:
+        return path
+    h, w = img.shape[:2]
+    if crop_center is not None:
+        half = _CROP_SIZE // 2
+        x0 = max(0, min(int(crop_center[0]) - half, w - _CROP_SIZE))
+        y0 = max(0, min(int(crop_center[1]) - half, h - _CROP_SIZE))
+        img = img[y0:y0 + _CROP_SIZE, x0:x0 + _CROP_SIZE]
+        suffix = "_crop"
+    elif max(h, w) > max_edge:
+        factor = max_edge / max(h, w)
+        img = cv2.resize(img, (max(1, round(w * factor)), max(1, round(h * factor))), interpolation=cv2.INTER_AREA)
+        suffix = "_small"
+    else:
+        return path
+    out_path = os.path.splitext(path)[0] + suffix + ".webp"
+    if not cv2.imwrite(out_path, img, [cv2.IMWRITE_WEBP_QUALITY, _WEBP_QUALITY]):
+        out_path = os.path.splitext(path)[0] + suffix + ".png"
+        cv2.imwrite(out_path, img)
+    return out_path
+
+
 class VisualInteractionInput(BaseModel):
     description: str = Field(..., description="Visual description of the element to interact with (e.g. 'the blue submit button', 'the discord server icon with text 03')")
     action: Literal["click", "double_click", "hover", "hover_and_confirm", "verify"] = Field(default="click", description="Action to perform. 'hover_and_confirm' will hover, wait, read tooltip, then click if match.")
@@ -20,18 +81,61 @@ class VisualInteractionOutput(BaseModel):
     error: str = ""
 
 class VisualInteractionSkill(BaseSkill):
-    def __init__(self, vision_skill: VisionSkill):
+    def __init__(self, vision_skill: VisionSkill, vision_concurrency: int = _VISION_CONCURRENCY):
         super().__init__()
         self.vision_skill = vision_skill
+        self.vision_concurrency = max(1, vision_concurrency)
+        # Created per event loop on first use (a Semaphore can't move between loops).
+        self._vision_sem: Optional[asyncio.Semaphore] = None
+        self._vision_sem_loop: Optional[asyncio.AbstractEventLoop] = None
         self.desktop_skill = DesktopSkill()
         self.cache = UICache()
         # Prefer SoM for small UI targets (higher click accuracy).
         try:
             model_name = getattr(getattr(self.vision_skill, "client", None), "model_name", "gpt-5.1")
-            self.som_skill = SoMVisionSkill(self.vision_skill.api_key, model_name=model_name)
+            self.som_skill = _shared_som_skill(self.vision_skill.api_key, model_name)
         except Exception:
             self.som_skill = None
 
+    async def _gated(self, fn, inp):
+        loop = asyncio.get_running_loop()
+        if self._vision_sem_loop is not loop:
+            self._vision_sem = asyncio.Semaphore(self.vision_concurrency)
+            self._vision_sem_loop = loop
+        contended = self._vision_sem.locked()
+        async with self._vision_sem:
+            if contended:
+                await asyncio.sleep(random.uniform(0, _VISION_JITTER_S))
+            return await fn(inp)
+
+    async def _vision(self, inp: VisionInput) -> VisionOutput:
+        return await self._gated(self.vision_skill.execute, inp)
+
+    async def _som(self, inp: SoMInput) -> SoMOutput:
+        return await self._gated(self.som_skill.execute, inp)
+
+    async def _capture_around(self, center: Tuple[int, int], screen_size: Optional[Tuple[int, int]]) -> Optional[str]:
+        """
+        Screenshot a _CROP_SIZE square around center and return its path, or None on failure.
+
+        Without a known screen size, takes a full capture and crops it instead.
+        """
+        if screen_size:
+            w, h = int(screen_size[0]), int(screen_size[1])
+            half = _CROP_SIZE // 2
+            left = max(0, min(int(center[0]) - half, w - _CROP_SIZE))
+            top = max(0, min(int(center[1]) - half, h - _CROP_SIZE))
+            region = [left, top, min(_CROP_SIZE, w), min(_CROP_SIZE, h)]
+            local_center = (int(center[0]) - left, int(center[1]) - top)
+        else:
+            region = None
+            local_center = center
+        view_out = await self.desktop_skill.execute(DesktopInput(action="screenshot", region=region))
+        if not view_out.success:
+            return None
+        # Also re-encodes a region capture as WebP
+        return await asyncio.to_thread(_prepare_vision_image, view_out.path, local_center)
+
     @property
     def default_config(self) -> SkillConfig:
         return SkillConfig(
@@ -54,45 +158,50 @@ class VisualInteractionSkill(BaseSkill):
             fixed_path = os.path.abspath("screenshots/_temp_locate.png")
             os.makedirs(os.path.dirname(fixed_path), exist_ok=True)
             
-            # Try cache first (fast path).
-            cached_coords = self.cache.get(inputs.description)
+            # Try cache first (fast path). Coordinates only carry over at the same resolution.
+            try:
+                screen_size = pyautogui.size()
+            except Exception:
+                screen_size = None
+            cache_key = UICache.make_key(inputs.description, screen_size)
+            cached_coords = self.cache.get(cache_key)
             coords = None
             
             if cached_coords:
                 print(f"[Cache] Using saved coords for '{inputs.description}': {cached_coords}")
                 coords = cached_coords
+            elif self.cache.is_negative(cache_key):
+                return VisualInteractionOutput(success=False, error=f"Could not locate '{inputs.description}' (failed moments ago; not retrying yet)")
             
             if not coords:
                 view_out = await self.desktop_skill.execute(DesktopInput(action="screenshot"))
                 if not view_out.success:
                      return VisualInteractionOutput(success=False, error=f"Screenshot failed: {view_out.error}")
-                
-                # Extract path from DesktopSkill output ("Screenshot saved to ...").
-                try:
-                    fixed_path = view_out.data.split("saved to ")[1].strip()
-                except:
-                     return VisualInteractionOutput(success=False, error="Could not get screenshot path")
+                fixed_path = view_out.path
 
                 # Use SoM if available (better for small icons/buttons).
                 if self.som_skill:
-                    som_out = await self.som_skill.execute(SoMInput(
+                    som_out = await self._som(SoMInput(
                         image_path=fixed_path,
                         target_description=inputs.description
                     ))
                     if not som_out.success or not som_out.coordinates:
+                        self.cache.set_negative(cache_key)
                         return VisualInteractionOutput(success=False, error=f"Could not locate '{inputs.description}': {som_out.error or 'No coordinates found'}")
                     coords = som_out.coordinates
                 else:
-                    vision_out = await self.vision_skill.execute(VisionInput(
+                    vision_out = await self._vision(VisionInput(
                         image_path=fixed_path,
                         query=inputs.description,
-                        mode=VisionMode.LOCATE
+                        mode=VisionMode.LOCATE,
+                        detail="high"
                     ))
                     if vision_out.error or not vision_out.coordinates:
+                        self.cache.set_negative(cache_key)
                         return VisualInteractionOutput(success=False, error=f"Could not locate '{inputs.description}': {vision_out.error or 'No coordinates found'}")
                     coords = vision_out.coordinates
                 # Save for next time.
-                self.cache.set(inputs.description, coords)
+                self.cache.set(cache_key, coords)
             
             x, y = coords
             
@@ -107,85 +216,120 @@ class VisualInteractionSkill(BaseSkill):
                 # Wait for tooltip to render.
                 await asyncio.sleep(1.0)
                 
-                # New screenshot for verification.
-                view_out_2 = await self.desktop_skill.execute(DesktopInput(action="screenshot"))
-                if not view_out_2.success:
+                # Capture just the area around the cursor for the check; the full screen is only
+                # needed if we have to recover.
+                crop_path = await self._capture_around((x, y), screen_size)
+                if crop_path is None:
                      return VisualInteractionOutput(success=False, error="Failed to take confirmation screenshot")
-                fixed_path = view_out_2.data.split("saved to ")[1].strip()
 
-                # Vision check near cursor.
+                # Vision check near cursor, on a crop around it.
                 check_query = f"I am hovering over an element. Is the text '{inputs.confirm_text}' OR an icon/symbol representing '{inputs.confirm_text}' (e.g. a Play Triangle, Gear icon, etc.) visible at or near the cursor position? Answer YES or NO."
-                vision_check = await self.vision_skill.execute(VisionInput(
-                    image_path=fixed_path,
+                vision_check = await self._vision(VisionInput(
+                    image_path=crop_path,
                     query=check_query,
-                    mode=VisionMode.DESCRIBE
+                    mode=VisionMode.DESCRIBE,
+                    detail="low"
                 ))
                 
                 if "yes" in vision_check.analysis.lower():
                     # Confirmed -> Click (and reinforce cache)
-                    self.cache.set(inputs.description, coords)
+                    self.cache.hit(cache_key)
                     act_out = await self.desktop_skill.execute(DesktopInput(action="click", x=x, y=y))
                     return VisualInteractionOutput(success=True, data=f"Confirmed '{inputs.confirm_text}' and clicked at {x},{y}")
                 else:
                     # Verification failed; retry by re-locating.
                     if cached_coords:
                          print("[Cache] Cached coords look stale; re-locating.")
-                         self.cache.set(inputs.description, None)
+                         self.cache.evict(cache_key)
                     
                     print("Verification failed. Re-analyzing screen...")
+                    view_out_2 = await self.desktop_skill.execute(DesktopInput(action="screenshot"))
+                    if not view_out_2.success:
+                         return VisualInteractionOutput(success=False, error="Failed to take recovery screenshot")
+                    fixed_path = view_out_2.path
                     cot_query = f"I failed to find '{inputs.description}' at the previous location. Look at the full screen. Is the element visible? detailedly describe its visual appearance and position (e.g. 'top right', 'center'). If it's a 'Play' button, look for triangles or 'Join' text."
+                    what_is_there_query = "I still can't find it. Briefly describe what IS at the cursor position (text, icon, color) so I can correct my plan."
                     
-                    analysis_out = await self.vision_skill.execute(VisionInput(
-                        image_path=fixed_path,
-                        query=cot_query,
-                        mode=VisionMode.DESCRIBE
-                    ))
-                    
-                    # Re-locate using the analysis.
+                    # The screen analysis and a direct re-locate are independent, so run them together;
+                    # the analysis only conditions a second LOCATE if the direct one finds nothing.
+                    small_path = await asyncio.to_thread(_prepare_vision_image, fixed_path)
+                    analysis_out, recovery_out = await asyncio.gather(
+                        self._vision(VisionInput(
+                            image_path=small_path,
+                            query=cot_query,
+                            mode=VisionMode.DESCRIBE
+                        )),
+                        self._vision(VisionInput(
+                            image_path=fixed_path,
+                            query=inputs.description,
+                            mode=VisionMode.LOCATE,
+                            detail="high"
+                        )),
+                    )
                     print(f"Screen analysis (snippet): {analysis_out.analysis[:50]}...")
-                    new_locate_query = f"Based on this analysis: '{analysis_out.analysis}', LOCATE the target element '{inputs.description}'."
                     
-                    recovery_out = await self.vision_skill.execute(VisionInput(
-                        image_path=fixed_path,
-                        query=new_locate_query,
-                        mode=VisionMode.LOCATE
-                    ))
+                    if not recovery_out.coordinates:
+                        # Re-locate using the analysis.
+                        new_locate_query = f"Based on this analysis: '{analysis_out.analysis}', LOCATE the target element '{inputs.description}'."
+                        recovery_out = await self._vision(VisionInput(
+                            image_path=fixed_path,
+                            query=new_locate_query,
+                            mode=VisionMode.LOCATE,
+                            detail="high"
+                        ))
                     
+                    cursor = (x, y)
+                    what_is_there = None
                     if recovery_out.coordinates:
                         xr, yr = recovery_out.coordinates
+                        cursor = (xr, yr)
                         print(f"Recovery found target at {xr},{yr}. Retrying...")
                         
                         # Move & verify again.
                         await self.desktop_skill.execute(DesktopInput(action="move", x=xr, y=yr))
                         await asyncio.sleep(1.0)
                         
-                        # New screenshot for verification.
-                        view_out_rec = await self.desktop_skill.execute(DesktopInput(action="screenshot"))
-                        fixed_path = view_out_rec.data.split("saved to ")[1].strip()
-
-                        verify_out = await self.vision_skill.execute(VisionInput(
-                            image_path=fixed_path,
-                            query=check_query,
-                            mode=VisionMode.DESCRIBE
-                        ))
+                        # Ask what is under the cursor speculatively alongside the check; it is
+                        # cancelled if the check passes.
+                        crop_path = await self._capture_around(cursor, screen_size)
+                        if crop_path is None:
+                             return VisualInteractionOutput(success=False, error="Failed to take confirmation screenshot")
+                        what_task = asyncio.create_task(self._vision(VisionInput(
+                            image_path=crop_path, query=what_is_there_query, mode=VisionMode.DESCRIBE, detail="low"
+                        )))
+                        try:
+                            verify_out = await self._vision(VisionInput(
+                                image_path=crop_path,
+                                query=check_query,
+                                mode=VisionMode.DESCRIBE,
+                                detail="low"
+                            ))
+                        except BaseException:
+                            what_task.cancel()
+                            raise
                         
                         if "yes" in verify_out.analysis.lower():
+                            what_task.cancel()
                             act_out = await self.desktop_skill.execute(DesktopInput(action="click", x=xr, y=yr))
                             # Update cache with the good coordinates.
-                            self.cache.set(inputs.description, [xr, yr])
+                            self.cache.set(cache_key, [xr, yr])
+                            self.cache.hit(cache_key)
                             return VisualInteractionOutput(success=True, data=f"Recovered and clicked '{inputs.description}' at {xr},{yr}")
+                        what_is_there = await what_task
                     
                     # If recovery fails, describe what's under the cursor to help debugging.
-                    what_is_there_query = "I still can't find it. Briefly describe what IS at the cursor position (text, icon, color) so I can correct my plan."
-                    what_is_there = await self.vision_skill.execute(VisionInput(image_path=fixed_path, query=what_is_there_query, mode=VisionMode.DESCRIBE))
+                    if what_is_there is None:
+                        crop_path = await asyncio.to_thread(_prepare_vision_image, fixed_path, cursor)
+                        what_is_there = await self._vision(VisionInput(image_path=crop_path, query=what_is_there_query, mode=VisionMode.DESCRIBE, detail="low"))
                     
                     return VisualInteractionOutput(success=False, error=f"Verification failed after recovery. Expected '{inputs.confirm_text}', but saw: {what_is_there.analysis}")
 
             # ... verify logic ...
             elif inputs.action == "verify":
                 check_query = f"Does the screen clearly contain the text or element '{inputs.description}'? Answer YES or NO."
-                vision_check = await self.vision_skill.execute(VisionInput(
-                    image_path=fixed_path,
+                small_path = await asyncio.to_thread(_prepare_vision_image, fixed_path)
+                vision_check = await self._vision(VisionInput(
+                    image_path=small_path,
                     query=check_query,
                     mode=VisionMode.DESCRIBE
                 ))
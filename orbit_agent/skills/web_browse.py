@@ -1,13 +1,74 @@
 import asyncio
+import re
 import httpx
-from typing import Type
+from typing import Type, Optional, Tuple, List, Dict
 from pydantic import BaseModel, Field
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
 
 from orbit_agent.skills.base import BaseSkill, SkillConfig
 
+# Add headers to avoid some bot blocks
+_DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+# Pages fetched at once for a multi-URL call
+_BATCH_CONCURRENCY = 8
+# Only <title> and <body> are built; <head> scripts, styles and meta never become nodes
+_STRAINER = SoupStrainer(["title", "body"])
+# Line breaks (as str.splitlines sees them) and double spaces split text into phrases
+_PHRASE_SPLIT_RE = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]|  ")
+_MAX_LINKS = 50
+# Bytes of body read per page; only the first 10k chars of text are returned anyway
+_MAX_BODY_BYTES = 2_000_000
+_TEXT_MIME_TYPES = ("application/xhtml+xml", "application/xml", "application/json")
+_SKIP_LINK_PREFIXES = ("#", "javascript:")
+
+def _parse_html(html: str) -> Tuple[str, str, List[str]]:
+    """Extract (title, clean text, links) from a page."""
+    soup = BeautifulSoup(html, 'lxml' if HAS_LXML else 'html.parser', parse_only=_STRAINER)
+    
+    # Cleanup (body-level scripts and page chrome survive the strainer)
+    for script in soup(["script", "style", "nav", "footer", "iframe"]):
+        script.decompose()
+    
+    title = soup.title.string if soup.title else ""
+    
+    text = soup.get_text(separator="\n")
+    
+    # Simple line cleanup
+    clean_text = '\n'.join(filter(None, map(str.strip, _PHRASE_SPLIT_RE.split(text))))
+    
+    # Extract links: first 50 unique in document order, skipping in-page anchors and JS handlers.
+    # Walk the tree lazily so link-heavy pages stop at the cap instead of collecting every anchor.
+    seen = {}
+    for el in soup.descendants:
+        if getattr(el, 'name', None) != 'a':
+            continue
+        href = el.get('href')
+        if not href or href.startswith(_SKIP_LINK_PREFIXES) or href in seen:
+            continue
+        seen[href] = None
+        if len(seen) >= _MAX_LINKS:
+            break
+    links = list(seen)
+    
+    return title, clean_text, links
+
 class BrowserInput(BaseModel):
     url: str = Field(description="URL to browse")
+    urls: Optional[list[str]] = Field(default=None, description="Optional extra URLs to fetch concurrently with 'url' (e.g. the top search results). Results are returned in 'pages'.")
     extract_main_content: bool = Field(default=True, description="If true, tries to extract only article text.")
 
 class BrowserOutput(BaseModel):
@@ -15,8 +76,30 @@ class BrowserOutput(BaseModel):
     content: str
     links: list[str] = []
     error: str = ""
+    pages: Dict[str, "BrowserOutput"] = Field(default_factory=dict, description="Results for the extra 'urls', keyed by URL")
 
 class WebBrowseSkill(BaseSkill):
+    def __init__(self, config: Optional[SkillConfig] = None):
+        super().__init__(config)
+        # Shared across calls so repeat hosts reuse keep-alive connections; created on first use.
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HAS_H2,
+                follow_redirects=True,
+                timeout=30.0,
+                headers=_DEFAULT_HEADERS,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     @property
     def default_config(self) -> SkillConfig:
         return SkillConfig(
@@ -34,39 +117,43 @@ class WebBrowseSkill(BaseSkill):
         return BrowserOutput
 
     async def execute(self, inputs: BrowserInput) -> BrowserOutput:
+        extra = [u for u in dict.fromkeys(inputs.urls or ()) if u != inputs.url]
+        if not extra:
+            return await self._browse(inputs.url)
+        
+        sem = asyncio.Semaphore(_BATCH_CONCURRENCY)
+        
+        async def _one(url: str) -> BrowserOutput:
+            async with sem:
+                return await self._browse(url)
+        
+        main, *rest = await asyncio.gather(*(_one(u) for u in [inputs.url, *extra]))
+        main.pages = dict(zip(extra, rest))
+        return main
+
+    async def _browse(self, url: str) -> BrowserOutput:
         try:
-             async with httpx.AsyncClient() as client:
-                # Add headers to avoid some bot blocks
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-                response = await client.get(inputs.url, follow_redirects=True, timeout=30.0, headers=headers)
-                
+            async with self._get_client().stream("GET", url) as response:
                 if response.status_code >= 400:
                     return BrowserOutput(title="", content="", error=f"HTTP Status {response.status_code}")
 
-                html = response.text
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Cleanup
-                for script in soup(["script", "style", "nav", "footer", "iframe"]):
-                    script.decompose()
-                
-                title = soup.title.string if soup.title else ""
-                
-                text = soup.get_text(separator="\n")
-                
-                # Simple line cleanup
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                clean_text = '\n'.join(chunk for chunk in chunks if chunk)
-                
-                # Extract links
-                links = [a.get('href') for a in soup.find_all('a', href=True)]
-                # Filter useful links? Keep all for now.
-                links = list(set(links))[:50] # Limit to 50
-                
-                return BrowserOutput(title=title, content=clean_text[:10000], links=links) # Limit text length
+                mime = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if mime and not (mime.startswith("text/") or mime in _TEXT_MIME_TYPES or mime.endswith("+xml")):
+                    size = response.headers.get("content-length", "unknown")
+                    return BrowserOutput(title="", content=f"[Non-text content: {mime}, {size} bytes]")
+
+                # Stop reading at the budget; huge pages would otherwise be held and parsed in full
+                buf = bytearray()
+                async for chunk in response.aiter_bytes():
+                    buf.extend(chunk)
+                    if len(buf) >= _MAX_BODY_BYTES:
+                        break
+                html = buf.decode(response.charset_encoding or "utf-8", errors="replace")
+
+            # Parsing is CPU-bound; keep it off the event loop
+            title, clean_text, links = await asyncio.to_thread(_parse_html, html)
+            
+            return BrowserOutput(title=title, content=clean_text[:10000], links=links) # Limit text length
 
         except Exception as e:
             return BrowserOutput(title="", content="", error=str(e))
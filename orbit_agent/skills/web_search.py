@@ -1,9 +1,22 @@
 import asyncio
-from typing import Type, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Type, List, Optional, Tuple
 from pydantic import BaseModel, Field
 from duckduckgo_search import DDGS
 from orbit_agent.skills.base import BaseSkill, SkillConfig
 
+# Searches run on their own small pool instead of the loop's default executor
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="websearch")
+# Identical (query, max_results) within this window reuse the previous results
+_CACHE_TTL_S = 300.0
+_CACHE_SIZE = 128
+_CACHE: "OrderedDict[Tuple[str, int], Tuple[float, List[SearchResult]]]" = OrderedDict()
+# One DDGS (and its HTTP client) per worker thread
+_local = threading.local()
+
 class SearchInput(BaseModel):
     query: str = Field(description="The search query")
     max_results: int = Field(default=5, description="Number of results to return")
@@ -17,6 +30,25 @@ class SearchOutput(BaseModel):
     results: List[SearchResult]
     error: str = ""
 
+def _ddgs() -> DDGS:
+    ddgs = getattr(_local, "ddgs", None)
+    if ddgs is None:
+        ddgs = _local.ddgs = DDGS()
+    return ddgs
+
+
+def _search(query: str, max_results: int) -> List[SearchResult]:
+    results = []
+    # 'text' is the basic search method; it returns a list of dicts
+    for r in _ddgs().text(query, max_results=max_results):
+        results.append(SearchResult(
+            title=r.get("title", ""),
+            href=r.get("href", ""),
+            body=r.get("body", "")
+        ))
+    return results
+
+
 class WebSearchSkill(BaseSkill):
     @property
     def default_config(self) -> SkillConfig:
@@ -36,25 +68,21 @@ class WebSearchSkill(BaseSkill):
 
     async def execute(self, inputs: SearchInput) -> SearchOutput:
         try:
-            # helper to run sync DDGS in async executor
-            def _search():
-                results = []
-                with DDGS() as ddgs:
-                    # 'text' is the basic search method
-                    # In newer versions it might be chat/text.
-                    # ddgs.text returns an iterator
-                    for r in ddgs.text(inputs.query, max_results=inputs.max_results):
-                        results.append(SearchResult(
-                            title=r.get("title", ""),
-                            href=r.get("href", ""),
-                            body=r.get("body", "")
-                        ))
-                return results
-
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(None, _search)
+            key = (inputs.query, inputs.max_results)
+            cached = _CACHE.get(key)
+            if cached is not None and time.monotonic() - cached[0] < _CACHE_TTL_S:
+                _CACHE.move_to_end(key)
+                return SearchOutput(results=list(cached[1]))
+
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(_EXECUTOR, _search, inputs.query, inputs.max_results)
+
+            _CACHE[key] = (time.monotonic(), results)
+            _CACHE.move_to_end(key)
+            while len(_CACHE) > _CACHE_SIZE:
+                _CACHE.popitem(last=False)
             
-            return SearchOutput(results=results)
+            return SearchOutput(results=list(results))
 
         except Exception as e:
             return SearchOutput(results=[], error=str(e))
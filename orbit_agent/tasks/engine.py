@@ -1,19 +1,52 @@
-import json
+import functools
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from uuid import UUID
-from datetime import datetime
+import time
 import asyncio
 
-from orbit_agent.tasks.models import Task, TaskStep, TaskState, StepState
+from pydantic import TypeAdapter
+
+from orbit_agent.tasks.models import DONE_STEP_STATES, Task, TaskStep, TaskState, StepState, utcnow
 from orbit_agent.config.config import OrbitConfig
 
+# Step transitions within this window are written to disk once
+_SAVE_DEBOUNCE_S = 0.1
+_TASK_CACHE_SIZE = 64
+# Validates straight against Task's core schema, skipping the classmethod dispatch per load
+_TASK_ADAPTER = TypeAdapter(Task)
+
+
+def _write_atomic(file_path: Path, data: str) -> Tuple[int, int]:
+    tmp_path = file_path.with_suffix(".json.tmp")
+    # Always write UTF-8 to avoid Windows cp1252 encoding crashes on unicode.
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_path, file_path)
+    st = os.stat(file_path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _report_save_error(task_id: UUID, fut: Future) -> None:
+    if fut.exception() is not None:
+        print(f"Failed to save task {task_id}: {fut.exception()}")
+
+
 class TaskEngine:
     def __init__(self, config: OrbitConfig):
         self.config = config
         self.persistence_path = Path(config.memory.path) / "tasks"
         self.persistence_path.mkdir(parents=True, exist_ok=True)
         self._current_task: Optional[Task] = None
+        # One writer thread keeps saves of the same task in order.
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-save")
+        self._pending_save: Dict[UUID, Tuple[asyncio.TimerHandle, Task]] = {}
+        self._last_write: Dict[UUID, Future] = {}
+        # task_id -> (file fingerprint, or the write that will produce it; Task)
+        self._task_cache: "OrderedDict[UUID, Tuple[Union[Tuple[int, int], Future], Task]]" = OrderedDict()
     
     def create_task(self, goal: str, steps: List[TaskStep]) -> Task:
         task = Task(goal=goal, steps=steps)
@@ -22,20 +55,76 @@ class TaskEngine:
         return task
 
     def save_task(self, task: Task) -> None:
-        """Save task state to disk for resumability."""
-        task.updated_at = datetime.utcnow()
+        """
+        Save task state to disk for resumability.
+
+        The snapshot is taken immediately and written atomically on the writer
+        thread. Inside a running event loop this returns without waiting for the
+        write; outside one (CLI) it blocks until the file is on disk.
+        """
+        pending = self._pending_save.pop(task.id, None)
+        if pending is not None:
+            pending[0].cancel()
+        task.updated_at = utcnow()
         file_path = self.persistence_path / f"{task.id}.json"
-        # Always write UTF-8 to avoid Windows cp1252 encoding crashes on unicode.
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(task.model_dump_json(indent=2))
+        data = task.model_dump_json(indent=2 if self.config.debug else None)
+        fut = self._writer.submit(_write_atomic, file_path, data)
+        fut.add_done_callback(functools.partial(_report_save_error, task.id))
+        self._last_write[task.id] = fut
+        self._remember(task, fut)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            fut.result()
+
+    def schedule_save(self, task: Task, delay: float = _SAVE_DEBOUNCE_S) -> None:
+        """Coalesce a burst of updates into one save_task after `delay` seconds."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_task(task)
+            return
+        if task.id not in self._pending_save:
+            self._pending_save[task.id] = (loop.call_later(delay, self.save_task, task), task)
+
+    def _flush(self, task_id: UUID) -> None:
+        """Write any debounced save for task_id and wait for its last write."""
+        pending = self._pending_save.get(task_id)
+        if pending is not None:
+            self.save_task(pending[1])
+        fut = self._last_write.pop(task_id, None)
+        if fut is not None:
+            fut.exception()  # wait; failures were already reported by the callback
+
+    def _remember(self, task: Task, key: Union[Tuple[int, int], Future]) -> None:
+        self._task_cache[task.id] = (key, task)
+        self._task_cache.move_to_end(task.id)
+        while len(self._task_cache) > _TASK_CACHE_SIZE:
+            self._task_cache.popitem(last=False)
 
     def load_task(self, task_id: UUID) -> Optional[Task]:
+        self._flush(task_id)
         file_path = self.persistence_path / f"{task_id}.json"
-        if not file_path.exists():
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            self._task_cache.pop(task_id, None)
             return None
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return Task(**data)
+        key = (st.st_mtime_ns, st.st_size)
+
+        cached = self._task_cache.get(task_id)
+        if cached is not None:
+            cached_key, task = cached
+            if isinstance(cached_key, Future):
+                cached_key = None if cached_key.exception() else cached_key.result()
+            if cached_key == key:
+                self._task_cache.move_to_end(task_id)
+                return task
+
+        with open(file_path, "rb") as f:
+            task = _TASK_ADAPTER.validate_json(f.read())
+        self._remember(task, key)
+        return task
 
     def get_runnable_steps(self, task: Task) -> List[TaskStep]:
         """
@@ -43,7 +132,7 @@ class TaskEngine:
         """
         runnable = []
         # Treat SKIPPED as terminal-success for dependency unblocking (plan changes, replaced steps, etc.)
-        completed_ids = {s.id for s in task.steps if s.state in (StepState.COMPLETED, StepState.SKIPPED)}
+        completed_ids = task.completed_ids
         
         for step in task.steps:
             if step.state in [StepState.PENDING, StepState.FAILED]:
@@ -53,7 +142,7 @@ class TaskEngine:
                          continue
                 
                 # Check dependencies
-                if all(dep_id in completed_ids for dep_id in step.dependencies):
+                if step.dependency_set <= completed_ids:
                     runnable.append(step)
         
         return runnable
@@ -62,6 +151,10 @@ class TaskEngine:
         step = task.get_step(step_id)
         if step:
             step.state = state
+            if state in DONE_STEP_STATES:
+                task.completed_ids.add(step_id)
+            else:
+                task.completed_ids.discard(step_id)
             if output:
                 step.output = output
             if error:
@@ -69,11 +162,13 @@ class TaskEngine:
             if state == StepState.FAILED:
                 step.retry_count += 1
             if state == StepState.RUNNING and not step.started_at:
-                step.started_at = datetime.utcnow()
+                step.started_at = utcnow()
+                step._started_mono = time.monotonic()
             if state in [StepState.COMPLETED, StepState.FAILED]:
-                step.completed_at = datetime.utcnow()
+                step.completed_at = utcnow()
+                step._completed_mono = time.monotonic()
             
-            self.save_task(task)
+            self.schedule_save(task)
 
     def check_task_completion(self, task: Task) -> bool:
         """Check if all steps are done, update task state."""
@@ -94,5 +189,7 @@ class TaskEngine:
 
     def add_step(self, task: Task, step: TaskStep) -> None:
         """Dynamically add a step to the task."""
-        task.steps.append(step)
-        self.save_task(task)
+        task.append_step(step)
+        if step.state in DONE_STEP_STATES:
+            task.completed_ids.add(step.id)
+        self.schedule_save(task)
@@ -1,8 +1,9 @@
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 class TaskState(str, Enum):
     PENDING = "pending"
@@ -20,12 +21,22 @@ class StepState(str, Enum):
     FAILED = "failed"
     SKIPPED = "skipped"
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _as_utc(dt: datetime) -> datetime:
+    """Files written before timestamps were tz-aware hold naive UTC values."""
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+# Step states that unblock dependents. SKIPPED counts as success (plan changes, replaced steps).
+DONE_STEP_STATES = frozenset({StepState.COMPLETED, StepState.SKIPPED})
+
 class Artifact(BaseModel):
     id: UUID = Field(default_factory=uuid4)
     name: str
     content: Optional[str] = None
     path: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
 
 class TaskStep(BaseModel):
     id: str = Field(description="Unique identifier for the step (e.g., 'research_api')")
@@ -44,6 +55,27 @@ class TaskStep(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+    _deps_fs: Optional[frozenset] = PrivateAttr(default=None)
+    # Monotonic clock readings for this run of the step (not persisted)
+    _started_mono: Optional[float] = PrivateAttr(default=None)
+    _completed_mono: Optional[float] = PrivateAttr(default=None)
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        """Seconds the step has run (so far, if still running); None if it never started."""
+        if self._started_mono is not None:
+            return (self._completed_mono or time.monotonic()) - self._started_mono
+        if self.started_at and self.completed_at:
+            return (_as_utc(self.completed_at) - _as_utc(self.started_at)).total_seconds()
+        return None
+
+    @property
+    def dependency_set(self) -> frozenset:
+        """Dependencies as a frozenset, built on first use."""
+        if self._deps_fs is None:
+            self._deps_fs = frozenset(self.dependencies)
+        return self._deps_fs
+
 class Task(BaseModel):
     id: UUID = Field(default_factory=uuid4)
     goal: str
@@ -54,11 +86,36 @@ class Task(BaseModel):
     artifacts: List[Artifact] = Field(default_factory=list)
     context: Dict[str, Any] = Field(default_factory=dict, description="Shared context/memory for the task")
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+    # IDs of steps in a terminal-success state; kept in sync by TaskEngine, rebuilt on load.
+    _completed_ids: Set[str] = PrivateAttr(default_factory=set)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._completed_ids = {s.id for s in self.steps if s.state in DONE_STEP_STATES}
+
+    @property
+    def completed_ids(self) -> Set[str]:
+        return self._completed_ids
     
+    # id -> first step with that id; rebuilt whenever the step count no longer matches.
+    _step_index: Dict[str, TaskStep] = PrivateAttr(default_factory=dict)
+    _indexed_steps: int = PrivateAttr(default=0)
+
     def get_step(self, step_id: str) -> Optional[TaskStep]:
-        for step in self.steps:
-            if step.id == step_id:
-                return step
-        return None
+        if self._indexed_steps != len(self.steps):
+            index: Dict[str, TaskStep] = {}
+            for step in self.steps:
+                index.setdefault(step.id, step)
+            self._step_index = index
+            self._indexed_steps = len(self.steps)
+        return self._step_index.get(step_id)
+
+    def append_step(self, step: TaskStep) -> None:
+        """Append a step, keeping the id index current."""
+        in_sync = self._indexed_steps == len(self.steps)
+        self.steps.append(step)
+        if in_sync:
+            self._step_index.setdefault(step.id, step)
+            self._indexed_steps += 1
@@ -0,0 +1,19 @@
+import pytest
+from orbit_agent.skills.file import FileReadSkill, FileWriteSkill
+from orbit_agent.skills.shell import ShellCommandSkill
+
+
+# These skills hold no per-call state, so one instance serves the whole run.
+@pytest.fixture(scope="session")
+def write_skill():
+    return FileWriteSkill()
+
+
+@pytest.fixture(scope="session")
+def read_skill():
+    return FileReadSkill()
+
+
+@pytest.fixture(scope="session")
+def shell_skill():
+    return ShellCommandSkill()
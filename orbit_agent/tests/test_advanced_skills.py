@@ -40,3 +40,48 @@ class Bar:
     assert "foo" in names
     assert "Bar" in names
     assert "baz" in names
+
+def test_som_detector_labels_sorted(tmp_path):
+    import cv2
+    import numpy as np
+    from orbit_agent.skills.som_vision import UIElementDetector
+
+    img = np.full((1440, 2560, 3), 240, np.uint8)
+    # Two rows of buttons, drawn out of order; each has text inside its outline.
+    for x, y in [(1800, 900), (200, 100), (1200, 100), (200, 900)]:
+        cv2.rectangle(img, (x, y), (x + 200, y + 80), (40, 90, 200), -1)
+        cv2.putText(img, "OK", (x + 60, y + 55), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2)
+    p = tmp_path / "shot.png"
+    cv2.imwrite(str(p), img)
+
+    elements, decoded = UIElementDetector().detect_elements(str(p))
+
+    assert decoded.shape == img.shape
+    assert [e['id'] for e in elements] == [1, 2, 3, 4]
+    # Top row left-to-right, then bottom row; nested text blobs are not separate elements.
+    assert [e['center'][0] < 1000 for e in elements] == [True, False, True, False]
+    assert elements[0]['center'][1] < 500 < elements[2]['center'][1]
+
+@pytest.mark.asyncio
+async def test_som_falls_back_when_fast_model_errors(tmp_path, monkeypatch):
+    import cv2
+    import numpy as np
+    from unittest.mock import AsyncMock
+    from orbit_agent.models.base import ModelResponse
+    from orbit_agent.skills.som_vision import SoMVisionSkill, SoMInput
+
+    monkeypatch.chdir(tmp_path)  # annotated image goes to ./screenshots
+    img = np.full((720, 1280, 3), 240, np.uint8)
+    cv2.rectangle(img, (200, 100), (400, 180), (40, 90, 200), -1)
+    p = tmp_path / "shot.png"
+    cv2.imwrite(str(p), img)
+
+    skill = SoMVisionSkill(api_key="test")
+    skill.fast_client.generate = AsyncMock(side_effect=RuntimeError("404 model not found"))
+    skill.client.generate = AsyncMock(return_value=ModelResponse(content='{"label": 1}'))
+
+    out = await skill.execute(SoMInput(image_path=str(p), target_description="the blue button"))
+
+    assert out.success, out.error
+    assert out.label_selected == 1
+    skill.client.generate.assert_awaited_once()
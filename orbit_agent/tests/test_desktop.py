@@ -15,6 +15,7 @@ async def test_desktop_screenshot_mocked(tmp_path):
         output = await skill.execute(inp)
         
         assert output.success is True
+        assert output.path == str(target)
         mock_gui.screenshot.assert_called_once_with(str(target))
 
 @pytest.mark.asyncio
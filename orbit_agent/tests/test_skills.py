@@ -1,15 +1,12 @@
 import pytest
 import os
 from pathlib import Path
-from orbit_agent.skills.file import FileReadSkill, FileWriteSkill, FileWriteInput, FileReadInput
-from orbit_agent.skills.shell import ShellCommandSkill, ShellInput
+from orbit_agent.skills.file import FileWriteInput, FileReadInput
+from orbit_agent.skills.shell import ShellInput
+from orbit_agent.skills.structured_edit import StructuredEditSkill, StructuredEditInput
 
 @pytest.mark.asyncio
-async def test_file_write_and_read(tmp_path):
-    # Setup
-    write_skill = FileWriteSkill()
-    read_skill = FileReadSkill()
-    
+async def test_file_write_and_read(tmp_path, write_skill, read_skill):
     test_file = tmp_path / "test.txt"
     content = "Hello Orbit"
     
@@ -27,28 +24,86 @@ async def test_file_write_and_read(tmp_path):
     assert read_output.content == content
 
 @pytest.mark.asyncio
-async def test_shell_command():
-    skill = ShellCommandSkill()
+async def test_shell_command(shell_skill):
     # Echo command is safe and universal? Powershell: 'echo' is alias for Write-Output
     # But shell=True in windows might need 'cmd /c' or 'powershell -c'.
     # default shell on windows in asyncio is usually cmd or ps?
     # Let's try simple 'echo hello'
     
     inp = ShellInput(command="echo hello")
-    output = await skill.execute(inp)
+    output = await shell_skill.execute(inp)
     
     assert output.exit_code == 0
     assert "hello" in output.stdout.lower()
 
 @pytest.mark.asyncio
-async def test_file_write_overwrite_check(tmp_path):
-    skill = FileWriteSkill()
+async def test_file_write_overwrite_check(tmp_path, write_skill):
     p = tmp_path / "protected.txt"
     p.write_text("should remain")
     
     inp = FileWriteInput(path=str(p), content="new content", overwrite=False)
-    output = await skill.execute(inp)
+    output = await write_skill.execute(inp)
     
     assert output.success is False
     assert "exists" in output.error
     assert p.read_text() == "should remain"
+
+@pytest.mark.asyncio
+async def test_shell_command_needs_shell(shell_skill):
+    # Pipelines go through the shell; builtins without an executable fall back to it.
+    output = await shell_skill.execute(ShellInput(command="echo piped | sort"))
+    assert output.exit_code == 0
+    assert "piped" in output.stdout
+
+    output = await shell_skill.execute(ShellInput(command="cd ."))
+    assert output.exit_code == 0
+
+
+@pytest.mark.asyncio
+async def test_structured_edit_round_trip(tmp_path):
+    skill = StructuredEditSkill()
+    test_file = tmp_path / "lines.txt"
+    test_file.write_text("one\ntwo\nthree\nfour\n", encoding="utf-8")
+    path = str(test_file)
+
+    out = await skill.execute(StructuredEditInput(action="edit", path=path, start_line=2, end_line=3, new_content="TWO\nTHREE\n"))
+    assert out.success is True
+    out = await skill.execute(StructuredEditInput(action="insert", path=path, start_line=1, new_content="one-b"))
+    assert out.lines_affected == [2]
+    out = await skill.execute(StructuredEditInput(action="delete", path=path, start_line=5, end_line=5))
+    assert out.success is True
+    assert test_file.read_text(encoding="utf-8") == "one\none-b\nTWO\nTHREE\n"
+
+    out = await skill.execute(StructuredEditInput(action="view", path=path, start_line=2, end_line=3))
+    assert out.content == "   2 | one-b\n   3 | TWO"
+    assert out.total_lines == 4
+
+    out = await skill.execute(StructuredEditInput(action="search", path=path, pattern="two", context_lines=1))
+    assert out.lines_affected == [3]
+    assert "   3 >>> TWO" in out.content
+
+
+@pytest.mark.asyncio
+async def test_structured_edit_search_bare_cr_lines(tmp_path):
+    skill = StructuredEditSkill()
+    test_file = tmp_path / "cr.txt"
+    test_file.write_bytes(b"one\rtwo\r\nthree\nfour needle\rfive")
+    path = str(test_file)
+
+    view = await skill.execute(StructuredEditInput(action="view", path=path, start_line=4, end_line=4))
+    out = await skill.execute(StructuredEditInput(action="search", path=path, pattern="needle", context_lines=0))
+    assert view.content == "   4 | four needle"
+    assert out.lines_affected == [4]
+    assert out.total_lines == view.total_lines == 5
+
+
+@pytest.mark.asyncio
+async def test_structured_edit_form_feed_is_not_a_line_break(tmp_path):
+    skill = StructuredEditSkill()
+    test_file = tmp_path / "ff.txt"
+    test_file.write_text("one\ntwo\n", encoding="utf-8")
+    path = str(test_file)
+
+    out = await skill.execute(StructuredEditInput(action="insert", path=path, start_line=1, new_content="page\x0cbreak"))
+    assert out.lines_affected == [2]
+    assert out.total_lines == 3
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from orbit_agent.config.config import OrbitConfig
+from orbit_agent.uplink.scheduler import JobStore, ScheduledJob
+from orbit_agent.uplink.telegram_bot import OrbitTelegramBot, UplinkConfig
+
+
+@pytest.mark.asyncio
+async def test_scheduler_requeues_batch_when_a_job_raises(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bot = OrbitTelegramBot(OrbitConfig(workspace_root=tmp_path / "workspace"), UplinkConfig(bot_token="x"))
+    bot.job_store = JobStore(str(tmp_path / "jobs.json"))
+
+    due = time.time() - 1
+    jobs = {
+        "a": ScheduledJob(id="a", user_id=1, chat_id=1, kind="interval", goal="a", next_run=due, interval_seconds=600),
+        "b": ScheduledJob(id="b", user_id=2, chat_id=2, kind="interval", goal="b", next_run=due, interval_seconds=600),
+    }
+    bot.job_store.save(jobs)
+    bot.jobs = bot.job_store.load()
+
+    ran = []
+
+    async def run_goal(job):
+        ran.append(job.id)
+        if job.id == "a":
+            raise RuntimeError("Blocked by permission policy")
+
+    bot._run_scheduled_goal = AsyncMock(side_effect=run_goal)
+
+    loop_task = asyncio.create_task(bot._scheduler_loop())
+    await asyncio.sleep(0.2)
+    loop_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await loop_task
+
+    # The failing job must not strand the rest of the popped batch...
+    assert sorted(ran) == ["a", "b"]
+    # ...and both stay scheduled for their next interval.
+    later = time.time() + 601
+    assert sorted(j.id for j in bot.job_store.pop_due(later)) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_job_store_put_coalesces_writes(tmp_path, monkeypatch):
+    from orbit_agent.uplink import scheduler
+
+    monkeypatch.setattr(scheduler, "_FLUSH_DELAY_S", 0.05)
+    path = tmp_path / "jobs.json"
+    store = JobStore(str(path))
+    writes = []
+    real_write = store._atomic_write
+    monkeypatch.setattr(store, "_atomic_write", lambda gen, data: (writes.append(gen), real_write(gen, data)))
+
+    store.put(ScheduledJob(id="a", user_id=1, chat_id=1, kind="once", goal="a", next_run=time.time() + 60))
+    store.put(ScheduledJob(id="b", user_id=1, chat_id=1, kind="once", goal="b", next_run=time.time() + 60))
+    assert not path.exists()
+
+    await asyncio.sleep(0.2)
+    assert len(writes) == 1
+    assert set(JobStore(str(path)).load()) == {"a", "b"}
+
+    # Nothing changed since the debounced write: flush() is a no-op.
+    store.flush()
+    assert len(writes) == 1
@@ -13,6 +13,7 @@ Prerequisites:
 """
 
 import asyncio
+import importlib.util
 import os
 import sys
 import logging
@@ -32,15 +33,24 @@ if sys.platform == "win32":
     except Exception:
         pass
 
+# Control characters (and DEL) removed from the bot token; non-ASCII is dropped via encode()
+_TOKEN_DELETE_CHARS = dict.fromkeys([*range(32), 127])
+# A Telegram bot token inside whatever else was pasted into the env var
+_TOKEN_RE = re.compile(r"\b\d{6,}:[A-Za-z0-9_-]{20,}\b")
+_USER_ID_RE = re.compile(r"\d+")
+
+
+def _exit_telegram_missing() -> None:
+    print("❌ python-telegram-bot is not installed.")
+    print("   Run: pip install python-telegram-bot")
+    sys.exit(1)
+
 
 def main():
     """Main entry point for Orbit Uplink."""
 
     from dotenv import load_dotenv
 
-    from orbit_agent.config.config import OrbitConfig
-    from orbit_agent.uplink.telegram_bot import OrbitTelegramBot, UplinkConfig, TELEGRAM_AVAILABLE
-    
     # Load environment variables
     load_dotenv()
 
@@ -53,32 +63,21 @@ def main():
             sys.stderr.reconfigure(encoding="utf-8", errors="backslashreplace")  # type: ignore[attr-defined]
         except Exception:
             pass
-
-        # Some libraries create StreamHandlers early and capture the old cp1252 stream.
-        # Rebind any existing StreamHandlers to the now-sanitized stderr.
-        try:
-            root = logging.getLogger()
-            for h in list(root.handlers):
-                if isinstance(h, logging.StreamHandler):
-                    h.stream = sys.stderr
-        except Exception:
-            pass
     
-    # Check dependencies
-    if not TELEGRAM_AVAILABLE:
-        print("❌ python-telegram-bot is not installed.")
-        print("   Run: pip install python-telegram-bot")
-        sys.exit(1)
+    # Check dependencies without importing python-telegram-bot yet
+    if importlib.util.find_spec("telegram") is None:
+        _exit_telegram_missing()
     
     # Get bot token
     def _sanitize_telegram_token(raw: str | None) -> str | None:
         if not raw:
             return None
-        cleaned = "".join(ch for ch in str(raw).strip() if 32 <= ord(ch) < 127)
-        m = re.search(r"\b\d{6,}:[A-Za-z0-9_-]{20,}\b", cleaned)
+        cleaned = str(raw).strip().encode("ascii", "ignore").decode("ascii").translate(_TOKEN_DELETE_CHARS)
+        m = _TOKEN_RE.search(cleaned)
         return m.group(0) if m else (cleaned or None)
 
-    bot_token = _sanitize_telegram_token(os.environ.get("TELEGRAM_BOT_TOKEN"))
+    env = os.environ
+    bot_token = _sanitize_telegram_token(env.get("TELEGRAM_BOT_TOKEN"))
     
     if not bot_token:
         print("❌ TELEGRAM_BOT_TOKEN not found in environment.")
@@ -91,6 +90,24 @@ def main():
         print('   TELEGRAM_BOT_TOKEN="your_token_here"')
         print("")
         sys.exit(1)
+
+    # Heavy imports (the agent stack and python-telegram-bot) only once we know we can start.
+    from orbit_agent.config.config import OrbitConfig
+    from orbit_agent.uplink.telegram_bot import OrbitTelegramBot, UplinkConfig, TELEGRAM_AVAILABLE
+
+    if not TELEGRAM_AVAILABLE:
+        _exit_telegram_missing()
+
+    if sys.platform == "win32":
+        # Some libraries create StreamHandlers early and capture the old cp1252 stream.
+        # Rebind any existing StreamHandlers to the now-sanitized stderr.
+        try:
+            root = logging.getLogger()
+            for h in list(root.handlers):
+                if isinstance(h, logging.StreamHandler):
+                    h.stream = sys.stderr
+        except Exception:
+            pass
     
     # Load Orbit config
     try:
@@ -100,16 +117,13 @@ def main():
         sys.exit(1)
     
     # Parse allowed users from environment
-    allowed_users_str = os.environ.get("ORBIT_UPLINK_USERS", "")
-    allowed_users = set()
-    if allowed_users_str:
-        try:
-            allowed_users = {int(uid.strip()) for uid in allowed_users_str.split(",") if uid.strip()}
-        except ValueError:
-            print("⚠️ Invalid ORBIT_UPLINK_USERS format. Use comma-separated IDs.")
+    allowed_users_str = env.get("ORBIT_UPLINK_USERS", "")
+    allowed_users = frozenset(map(int, _USER_ID_RE.findall(allowed_users_str)))
+    if allowed_users_str.strip() and not allowed_users:
+        print("⚠️ Invalid ORBIT_UPLINK_USERS format. Use comma-separated IDs.")
     
     # Create uplink config
-    screenshots_env = os.environ.get("ORBIT_UPLINK_SCREENSHOTS", "")
+    screenshots_env = env.get("ORBIT_UPLINK_SCREENSHOTS", "")
     screenshot_on_task = str(screenshots_env).strip().lower() in {"1", "true", "yes", "on"}
     uplink_config = UplinkConfig(
         enabled=True,
@@ -130,6 +144,11 @@ def main():
         print("   Example: ORBIT_UPLINK_USERS=123456789,987654321")
         print("")
         
+        # Under systemd/Docker there is nobody to answer; don't block on stdin.
+        if not sys.stdin or not sys.stdin.isatty():
+            print("❌ No TTY; refusing to start without ORBIT_UPLINK_USERS.")
+            sys.exit(1)
+
         # Ask for confirmation
         try:
             response = input("Continue anyway? [y/N] ")
@@ -1,13 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from dataclasses import dataclass, asdict
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+# put() calls within this window are written together
+_FLUSH_DELAY_S = 0.5
+
+# (iso string, whole second it was formatted for); touch() reuses it within a second
+_last_iso: tuple[str, int] = ("", 0)
+
+
+def _now_iso() -> str:
+    global _last_iso
+    t = int(time.time())
+    if t != _last_iso[1]:
+        _last_iso = (datetime.fromtimestamp(t).isoformat(), t)
+    return _last_iso[0]
+
+
+@dataclass(slots=True)
 class UserProfile:
     """
     Minimal per-user persona/profile for Uplink.
@@ -25,38 +49,102 @@ class UserProfile:
 
     @classmethod
     def from_dict(cls, raw: Dict[str, Any]) -> "UserProfile":
-        try:
-            return cls(**{k: raw.get(k) for k in cls().__dict__.keys()})
-        except Exception:
-            # Best-effort: accept partial/unknown fields.
-            p = cls()
-            for k in p.__dict__.keys():
-                if k in raw:
-                    setattr(p, k, raw.get(k) or "")
-            return p
+        # Unknown keys are ignored; missing or null ones keep the "" default.
+        return cls(**{k: raw[k] or "" for k in _PROFILE_FIELDS if k in raw})
 
     def touch(self) -> None:
-        now = datetime.now().isoformat()
+        now = _now_iso()
         if not self.created_at:
             self.created_at = now
         self.updated_at = now
 
 
+_PROFILE_FIELDS = tuple(f.name for f in fields(UserProfile))
+
+
 class ProfileStore:
     """
     Tiny JSON-backed profile store.
     Keys are channel-qualified (e.g. 'telegram:123456').
+
+    The file is parsed once; load() returns the cached dict after that. put()
+    only marks the store dirty and, inside an event loop, schedules one write
+    for all puts in the next _FLUSH_DELAY_S; flush() writes immediately.
+    save() always writes. Writes replace the file atomically.
     """
 
     def __init__(self, path: str = "data/uplink/profiles.json"):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache: Optional[Dict[str, UserProfile]] = None
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        # Writes can come from the loop (save/flush) and worker threads (debounced flush);
+        # each snapshot gets a generation so an older one never lands over a newer one.
+        self._write_lock = threading.Lock()
+        self._gen = 0
+        self._written_gen = 0
 
     def load(self) -> Dict[str, UserProfile]:
+        if self._cache is None:
+            self._cache = self._load_sync()
+        return self._cache
+
+    def save(self, profiles: Dict[str, UserProfile]) -> None:
+        self._cache = profiles
+        self._dirty = False
+        self._atomic_write(*self._snapshot())
+
+    def get(self, key: str) -> Optional[UserProfile]:
+        return self.load().get(key)
+
+    def put(self, key: str, profile: UserProfile) -> None:
+        self.load()[key] = profile
+        self._dirty = True
+        self._schedule_flush()
+
+    def flush(self) -> None:
+        """Write the cached profiles if anything was put() since the last write."""
+        if self._dirty and self._cache is not None:
+            self.save(self._cache)
+
+    async def aload(self) -> Dict[str, UserProfile]:
+        """load() on a worker thread, for async handlers."""
+        if self._cache is None:
+            self._cache = await asyncio.to_thread(self._load_sync)
+        return self._cache
+
+    async def asave(self, profiles: Dict[str, UserProfile]) -> None:
+        """save() with the file write on a worker thread, for async handlers."""
+        self._cache = profiles
+        self._dirty = False
+        # Encode here so later puts can't mutate the dict mid-serialization.
+        await asyncio.to_thread(self._atomic_write, *self._snapshot())
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sync callers flush() themselves
+        self._flush_task = loop.create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        await asyncio.sleep(_FLUSH_DELAY_S)
+        if self._dirty and self._cache is not None:
+            self._dirty = False
+            # Encode here so later puts can't mutate the dict mid-serialization.
+            await asyncio.to_thread(self._atomic_write, *self._snapshot())
+
+    def _load_sync(self) -> Dict[str, UserProfile]:
         if not self.path.exists():
             return {}
         try:
-            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            if HAS_ORJSON:
+                raw = orjson.loads(self.path.read_bytes())
+            else:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
             out: Dict[str, UserProfile] = {}
             for k, v in (raw or {}).items():
                 if isinstance(v, dict):
@@ -65,7 +153,22 @@ class ProfileStore:
         except Exception:
             return {}
 
-    def save(self, profiles: Dict[str, UserProfile]) -> None:
+    @staticmethod
+    def _encode(profiles: Dict[str, UserProfile]) -> bytes:
         payload = {k: asdict(p) for k, p in profiles.items()}
-        self.path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        if HAS_ORJSON:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        return json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def _snapshot(self) -> Tuple[int, bytes]:
+        self._gen += 1
+        return self._gen, self._encode(self._cache or {})
 
+    def _atomic_write(self, gen: int, data: bytes) -> None:
+        with self._write_lock:
+            if gen < self._written_gen:
+                return
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path)
+            self._written_gen = gen
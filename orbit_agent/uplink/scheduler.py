@@ -1,11 +1,25 @@
+import asyncio
+import heapq
 import json
+import os
+import threading
+import time
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+# put() calls within this window are written together
+_FLUSH_DELAY_S = 0.5
+
+
+@dataclass(slots=True)
 class ScheduledJob:
     id: str
     user_id: int
@@ -23,17 +37,104 @@ class JobStore:
     """
     Tiny JSON-backed scheduler store.
     Keeps jobs in ./data/uplink/jobs.json by default.
+
+    The file is parsed once; load() returns the cached dict after that. put()
+    only marks the store dirty and, inside an event loop, schedules one write
+    for all puts in the next _FLUSH_DELAY_S; flush() writes immediately.
+    save() always writes. Writes replace the file atomically.
+
+    Enabled jobs are also kept in a (next_run, job_id) min-heap so the scheduler
+    tick only touches jobs that are due. Heap entries are never updated in place:
+    save() rebuilds it, put()/schedule() push, and pop_due() drops stale entries.
     """
 
     def __init__(self, path: str = "data/uplink/jobs.json"):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache: Optional[Dict[str, ScheduledJob]] = None
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        # Writes can come from the loop (save/flush) and worker threads (debounced flush);
+        # each snapshot gets a generation so an older one never lands over a newer one.
+        self._write_lock = threading.Lock()
+        self._gen = 0
+        self._written_gen = 0
+        self._heap: List[Tuple[float, str]] = []
 
     def load(self) -> Dict[str, ScheduledJob]:
+        if self._cache is None:
+            self._cache = self._load_sync()
+            self._rebuild_heap()
+        return self._cache
+
+    def save(self, jobs: Dict[str, ScheduledJob]) -> None:
+        self._cache = jobs
+        self._dirty = False
+        self._rebuild_heap()
+        self._atomic_write(*self._snapshot())
+
+    def schedule(self, job: ScheduledJob) -> None:
+        """Queue job at its current next_run (put() does this for you)."""
+        if job.enabled and job.next_run:
+            heapq.heappush(self._heap, (job.next_run, job.id))
+
+    def pop_due(self, now: float) -> List[ScheduledJob]:
+        """Remove and return enabled jobs with next_run <= now, earliest first."""
+        jobs = self.load()
+        due: List[ScheduledJob] = []
+        seen = set()
+        while self._heap and self._heap[0][0] <= now:
+            ts, job_id = heapq.heappop(self._heap)
+            job = jobs.get(job_id)
+            # Skip tombstones: deleted/disabled jobs and entries superseded by a newer next_run.
+            if job is None or not job.enabled or job.next_run != ts or job_id in seen:
+                continue
+            seen.add(job_id)
+            due.append(job)
+        return due
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(j.next_run, j.id) for j in (self._cache or {}).values() if j.enabled and j.next_run]
+        heapq.heapify(self._heap)
+
+    def get(self, job_id: str) -> Optional[ScheduledJob]:
+        return self.load().get(job_id)
+
+    def put(self, job: ScheduledJob) -> None:
+        self.load()[job.id] = job
+        self.schedule(job)
+        self._dirty = True
+        self._schedule_flush()
+
+    def flush(self) -> None:
+        """Write the cached jobs if anything was put() since the last write."""
+        if self._dirty and self._cache is not None:
+            self.save(self._cache)
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sync callers flush() themselves
+        self._flush_task = loop.create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        await asyncio.sleep(_FLUSH_DELAY_S)
+        if self._dirty and self._cache is not None:
+            self._dirty = False
+            # Encode here so later puts can't mutate the dict mid-serialization.
+            await asyncio.to_thread(self._atomic_write, *self._snapshot())
+
+    def _load_sync(self) -> Dict[str, ScheduledJob]:
         if not self.path.exists():
             return {}
         try:
-            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if HAS_ORJSON:
+                data = orjson.loads(self.path.read_bytes())
+            else:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
             jobs: Dict[str, ScheduledJob] = {}
             for job_id, raw in data.items():
                 jobs[job_id] = ScheduledJob(**raw)
@@ -41,20 +142,45 @@ class JobStore:
         except Exception:
             return {}
 
-    def save(self, jobs: Dict[str, ScheduledJob]) -> None:
+    @staticmethod
+    def _encode(jobs: Dict[str, ScheduledJob]) -> bytes:
         payload = {job_id: asdict(job) for job_id, job in jobs.items()}
-        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        if HAS_ORJSON:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        return json.dumps(payload, indent=2).encode("utf-8")
+
+    def _snapshot(self) -> Tuple[int, bytes]:
+        self._gen += 1
+        return self._gen, self._encode(self._cache or {})
 
+    def _atomic_write(self, gen: int, data: bytes) -> None:
+        with self._write_lock:
+            if gen < self._written_gen:
+                return
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path)
+            self._written_gen = gen
 
-def compute_next_run(job: ScheduledJob, now: Optional[datetime] = None) -> float:
-    now_dt = now or datetime.now()
 
+def compute_next_run(job: ScheduledJob, now: Optional[datetime] = None, now_ts: Optional[float] = None) -> float:
+    """
+    Next unix timestamp for a job. Pass now (datetime) or now_ts (unix seconds) to
+    evaluate several jobs against one clock reading.
+    """
     if job.kind == "interval":
-        if not job.interval_seconds:
-            return (now_dt + timedelta(minutes=10)).timestamp()
-        return (now_dt + timedelta(seconds=job.interval_seconds)).timestamp()
+        # Plain seconds arithmetic; only daily jobs need calendar math.
+        if now_ts is None:
+            now_ts = now.timestamp() if now else time.time()
+        return now_ts + (job.interval_seconds or 600)
 
     if job.kind == "daily":
+        if now is not None:
+            now_dt = now
+        elif now_ts is not None:
+            now_dt = datetime.fromtimestamp(now_ts)
+        else:
+            now_dt = datetime.now()
         # daily_time = "HH:MM"
         try:
             hh, mm = (job.daily_time or "09:00").split(":")
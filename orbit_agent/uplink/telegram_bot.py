@@ -24,7 +24,7 @@ import hashlib
 from datetime import datetime, timedelta
 from uuid import uuid4
 from pathlib import Path
-from typing import Optional, List, Set, Dict, Any
+from typing import Optional, List, Set, FrozenSet, Dict, Any
 from dataclasses import dataclass
 
 try:
@@ -64,7 +64,7 @@ class UplinkConfig:
     enabled: bool = True
     platform: str = "telegram"
     bot_token: Optional[str] = None
-    allowed_users: Set[int] = None  # Telegram user IDs allowed to control
+    allowed_users: Optional[FrozenSet[int]] = None  # Telegram user IDs allowed to control
     require_auth: bool = True
     screenshot_on_task: bool = True  # Auto-attach screenshot for task completions
 
@@ -122,7 +122,8 @@ class OrbitTelegramBot:
         self._scheduler_task: Optional[asyncio.Task] = None
         
         # Security: Track authorized users
-        self.authorized_users: Set[int] = uplink_config.allowed_users or set()
+        # Own mutable copy: /auth adds users at runtime, the config set stays frozen
+        self.authorized_users: Set[int] = set(uplink_config.allowed_users or ())
         self.pending_auth: Set[int] = set()
     
     async def initialize(self):
@@ -181,7 +182,7 @@ class OrbitTelegramBot:
         self.conversations = self.conversation_store.load()
 
         # Load persisted profiles
-        self.profiles = self.profile_store.load()
+        self.profiles = await self.profile_store.aload()
 
     async def _gateway_pulse_loop(self) -> None:
         """
@@ -667,34 +668,37 @@ class OrbitTelegramBot:
         # Runs forever; checks due jobs and triggers them.
         while True:
             try:
-                now = datetime.now().timestamp()
-                due: List[ScheduledJob] = []
+                now = time.time()
 
                 async with self._jobs_lock:
-                    for job in self.jobs.values():
-                        if job.enabled and job.next_run and job.next_run <= now:
-                            due.append(job)
+                    due: List[ScheduledJob] = self.job_store.pop_due(now)
 
                 for job in due:
                     # If user currently running something, delay a bit
                     if job.user_id in self.active_tasks:
                         async with self._jobs_lock:
-                            job.next_run = datetime.now().timestamp() + 60
-                            self.job_store.save(self.jobs)
+                            job.next_run = time.time() + 60
+                            self.job_store.put(job)
                         continue
 
-                    # Special-case heartbeat jobs (polished check-in, not a full agent run).
-                    if str(job.id).startswith("hb_"):
-                        await self._run_heartbeat(job)
-                    else:
-                        await self._run_scheduled_goal(job)
-
-                    async with self._jobs_lock:
-                        if job.kind in ("interval", "daily"):
-                            job.next_run = compute_next_run(job)
+                    try:
+                        # Special-case heartbeat jobs (polished check-in, not a full agent run).
+                        if str(job.id).startswith("hb_"):
+                            await self._run_heartbeat(job)
                         else:
-                            job.enabled = False
-                        self.job_store.save(self.jobs)
+                            await self._run_scheduled_goal(job)
+                    except Exception as e:
+                        logger.warning(f"[Scheduler] job {job.id} failed: {e}")
+                    finally:
+                        # pop_due() took the job off the heap; always put it back (or retire it).
+                        async with self._jobs_lock:
+                            if job.kind in ("interval", "daily"):
+                                job.next_run = compute_next_run(job)
+                            else:
+                                job.enabled = False
+                            # /heartbeat may have replaced the job while it ran; keep the new one.
+                            if self.jobs.get(job.id) is job:
+                                self.job_store.put(job)
 
             except Exception as e:
                 logger.warning(f"[Scheduler] loop error: {e}")
@@ -1070,8 +1074,7 @@ Send a photo and I'll analyze it!
         )
 
         async with self._jobs_lock:
-            self.jobs[job_id] = job
-            self.job_store.save(self.jobs)
+            self.job_store.put(job)
 
         await update.message.reply_text(f"✅ Scheduled in {minutes} min. Job id: `{job_id}`", parse_mode="Markdown")
 
@@ -1104,8 +1107,7 @@ Send a photo and I'll analyze it!
         job.next_run = compute_next_run(job)
 
         async with self._jobs_lock:
-            self.jobs[job_id] = job
-            self.job_store.save(self.jobs)
+            self.job_store.put(job)
 
         await update.message.reply_text(f"✅ Scheduled daily at {hhmm}. Job id: `{job_id}`", parse_mode="Markdown")
 
@@ -1150,7 +1152,7 @@ Send a photo and I'll analyze it!
                 await update.message.reply_text("Not your job.")
                 return
             job.enabled = False
-            self.job_store.save(self.jobs)
+            self.job_store.put(job)
 
         await update.message.reply_text(f"✅ Cancelled `{job_id}`", parse_mode="Markdown")
 
@@ -1181,7 +1183,7 @@ Send a photo and I'll analyze it!
             async with self._jobs_lock:
                 if job_id in self.jobs:
                     self.jobs[job_id].enabled = False
-                    self.job_store.save(self.jobs)
+                    self.job_store.put(self.jobs[job_id])
             await update.message.reply_text("✅ Heartbeat disabled.")
             return
 
@@ -1205,8 +1207,7 @@ Send a photo and I'll analyze it!
         job.next_run = compute_next_run(job)
 
         async with self._jobs_lock:
-            self.jobs[job_id] = job
-            self.job_store.save(self.jobs)
+            self.job_store.put(job)
 
         await update.message.reply_text(f"✅ Heartbeat enabled every {minutes} min.")
 
@@ -1959,6 +1960,9 @@ Answer naturally as if you're a helpful friend."""
         except asyncio.CancelledError:
             pass
         finally:
+            # put() debounces writes; persist anything still pending.
+            self.job_store.flush()
+            self.profile_store.flush()
             await self.app.updater.stop()
             await self.app.stop()
             await self.app.shutdown()
@@ -592,8 +592,7 @@ class OnboardingWorkflow(BaseWorkflow):
         p.touch()
 
         key = f"telegram:{user_id}"
-        bot.profiles[key] = p
-        bot.profile_store.save(bot.profiles)
+        bot.profile_store.put(key, p)
 
         summary = []
         if p.preferred_name: